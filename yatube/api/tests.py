@@ -0,0 +1,103 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator
+
+TEST_OF_POST = 25
+
+
+class ApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='kir', first_name='Кирилл'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(TEST_OF_POST):
+            cls.post = Post.objects.create(
+                text=f'Тестовый пост {i}',
+                author=cls.user,
+                group=cls.group if i % 2 else None,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_json(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.status_code, json.loads(response.content)
+
+    def test_post_list_walks_cursor_pages(self):
+        """Лента постов проходится по курсорам без пропусков."""
+        url = reverse('api:post_list')
+        texts = []
+        while url:
+            status, data = self.get_json(url)
+            self.assertEqual(status, 200)
+            texts += [post['text'] for post in data['results']]
+            url = data['next']
+        self.assertEqual(
+            texts, [f'Тестовый пост {i}' for i in reversed(range(25))]
+        )
+
+    def test_fields_select_columns(self):
+        """?fields= оставляет в ответе и в SQL только нужные поля."""
+        with self.assertNumQueries(1) as queries:
+            self.get_json(reverse('api:post_list'), fields='text,group')
+        sql = queries.captured_queries[0]['sql']
+        self.assertNotIn('"edited"', sql)
+        self.assertNotIn('auth_user', sql)
+        _, data = self.get_json(reverse('api:post_list'), fields='text,group')
+        self.assertEqual(set(data['results'][0]), {'text', 'group'})
+        status, data = self.get_json(reverse('api:post_list'), fields='x')
+        self.assertEqual(status, 400)
+
+    def test_group_and_profile(self):
+        """Группа, профиль и их посты отдаются в JSON."""
+        _, group = self.get_json(
+            reverse('api:group_detail', kwargs={'slug': self.group.slug})
+        )
+        self.assertEqual(group['posts_count'], TEST_OF_POST // 2)
+        _, posts = self.get_json(
+            reverse('api:group_posts', kwargs={'slug': self.group.slug}),
+            fields='group',
+        )
+        self.assertEqual(
+            {post['group'] for post in posts['results']}, {self.group.slug}
+        )
+        _, author = self.get_json(
+            reverse('api:profile', kwargs={'username': self.user.username})
+        )
+        self.assertEqual(author['first_name'], 'Кирилл')
+        self.assertEqual(author['posts_count'], TEST_OF_POST)
+        _, groups = self.get_json(reverse('api:group_list'))
+        self.assertEqual(groups['count'], 1)
+
+    def test_unknown_objects_return_404(self):
+        """Несуществующие объекты отдают 404 в JSON."""
+        for url in (
+            reverse('api:post_detail', kwargs={'post_id': 10 ** 6}),
+            reverse('api:group_posts', kwargs={'slug': 'unknown'}),
+            reverse('api:profile', kwargs={'username': 'unknown'}),
+        ):
+            with self.subTest(url=url):
+                status, data = self.get_json(url)
+                self.assertEqual(status, 404)
+
+    def test_cursor_paginator_accepts_dicts(self):
+        """CursorPaginator работает со строками values()."""
+        paginator = CursorPaginator(Post.objects.values('id', 'pub_date'), 10)
+        page = paginator.get_page(None)
+        second = paginator.get_page(page.next_cursor)
+        self.assertEqual(len(second), 10)
+        self.assertTrue(second.has_previous())
@@ -0,0 +1,209 @@
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+
+from core.query_budget import query_budget
+from posts.cache import (
+    cache_feed_page, conditional_feed, group_feed, index_feed, post_feeds,
+    profile_feed
+)
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator
+
+PAGE_SIZE = 20
+# Имя поля в ответе -> выражение для values().
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'edited': 'edited',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+GROUP_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+    'posts_count': 'posts_count',
+}
+PROFILE_FIELDS = {
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'posts_count': 'post_counter__posts_count',
+}
+# Ключ курсора нужен всегда, даже если клиент его не запросил.
+CURSOR_FIELDS = ('id', 'pub_date')
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def not_found():
+    return json_response({'detail': 'Не найдено'}, status=404)
+
+
+def requested_fields(request, available):
+    """Поля из ?fields=a,b в порядке запроса; по умолчанию все."""
+    fields = [
+        name for name in request.GET.get('fields', '').split(',') if name
+    ]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise InvalidFields(', '.join(unknown))
+    return fields or list(available)
+
+
+def project(queryset, fields, available, extra=()):
+    """values() только с нужными колонками: модели не создаются."""
+    lookups = {available[name]: name for name in fields}
+    for name in extra:
+        lookups.setdefault(name, name)
+    return queryset.values(*lookups), lookups
+
+
+def rename(row, lookups, fields):
+    return {name: row[lookup] for lookup, name in lookups.items()
+            if name in fields}
+
+
+def api_view(available):
+    """Разбирает ?fields= и отвечает 400 на неизвестные поля."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                fields = requested_fields(request, available)
+            except InvalidFields as error:
+                return json_response(
+                    {'detail': f'Неизвестные поля: {error}'}, status=400
+                )
+            return view(request, fields, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def page_url(request, **params):
+    query = request.GET.copy()
+    query.pop('cursor', None)
+    query.pop('page', None)
+    query.update(params)
+    return f'{request.path}?{urlencode(sorted(query.items()))}'
+
+
+def post_page(request, queryset, fields):
+    rows, lookups = project(
+        queryset, fields, POST_FIELDS, extra=CURSOR_FIELDS
+    )
+    page = CursorPaginator(rows, PAGE_SIZE).get_page(
+        request.GET.get('cursor')
+    )
+    return json_response({
+        'results': [rename(row, lookups, fields) for row in page],
+        'next': page.next_cursor and page_url(
+            request, cursor=page.next_cursor
+        ),
+        'previous': page.previous_cursor and page_url(
+            request, cursor=page.previous_cursor
+        ),
+    })
+
+
+def get_row(queryset, fields, available, **lookup):
+    rows, lookups = project(queryset.filter(**lookup), fields, available)
+    row = rows.first()
+    return row and rename(row, lookups, fields)
+
+
+@query_budget(3)
+@conditional_feed(index_feed)
+@cache_feed_page(index_feed)
+@api_view(POST_FIELDS)
+def post_list(request, fields):
+    return post_page(request, Post.objects.all(), fields)
+
+
+@query_budget(4)
+@conditional_feed(post_feeds)
+@api_view(POST_FIELDS)
+def post_detail(request, fields, post_id):
+    post = get_row(Post.objects.all(), fields, POST_FIELDS, id=post_id)
+    return json_response(post) if post else not_found()
+
+
+@query_budget(4)
+@api_view(GROUP_FIELDS)
+def group_list(request, fields):
+    rows, lookups = project(
+        Group.objects.order_by('title', 'id'), fields, GROUP_FIELDS
+    )
+    page = Paginator(rows, PAGE_SIZE).get_page(request.GET.get('page'))
+    next_url = previous_url = None
+    if page.has_next():
+        next_url = page_url(request, page=page.next_page_number())
+    if page.has_previous():
+        previous_url = page_url(request, page=page.previous_page_number())
+    return json_response({
+        'count': page.paginator.count,
+        'results': [rename(row, lookups, fields) for row in page],
+        'next': next_url,
+        'previous': previous_url,
+    })
+
+
+@query_budget(3)
+@conditional_feed(group_feed)
+@api_view(GROUP_FIELDS)
+def group_detail(request, fields, slug):
+    group = get_row(Group.objects.all(), fields, GROUP_FIELDS, slug=slug)
+    return json_response(group) if group else not_found()
+
+
+@query_budget(4)
+@conditional_feed(group_feed)
+@cache_feed_page(group_feed)
+@api_view(POST_FIELDS)
+def group_posts(request, fields, slug):
+    group_id = Group.objects.filter(slug=slug).values_list(
+        'id', flat=True
+    ).first()
+    if group_id is None:
+        return not_found()
+    return post_page(request, Post.objects.filter(group_id=group_id), fields)
+
+
+@query_budget(3)
+@conditional_feed(profile_feed)
+@api_view(PROFILE_FIELDS)
+def profile(request, fields, username):
+    author = get_row(
+        User.objects.all(), fields, PROFILE_FIELDS, username=username
+    )
+    if author and 'posts_count' in author:
+        author['posts_count'] = author['posts_count'] or 0
+    return json_response(author) if author else not_found()
+
+
+@query_budget(4)
+@conditional_feed(profile_feed)
+@cache_feed_page(profile_feed)
+@api_view(POST_FIELDS)
+def profile_posts(request, fields, username):
+    author_id = User.objects.filter(username=username).values_list(
+        'id', flat=True
+    ).first()
+    if author_id is None:
+        return not_found()
+    return post_page(
+        request, Post.objects.filter(author_id=author_id), fields
+    )
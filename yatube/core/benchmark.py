@@ -0,0 +1,82 @@
+import json
+import math
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(timings):
+    """Сводка по замерам в секундах: p50/p95/среднее в миллисекундах."""
+    return {
+        'runs': len(timings),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+    }
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_report(name, results, **extra):
+    return {
+        'benchmark': name,
+        'revision': git_revision(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        **extra,
+        'results': results,
+    }
+
+
+def write_report(path, report):
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=2)
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as report_file:
+        return json.load(report_file)
+
+
+def compare_results(old, new, fields=('p50_ms', 'p95_ms', 'queries')):
+    """Строки вида `case field: old -> new (+x%)` для общих замеров."""
+    lines = []
+    for case in sorted(set(old) & set(new)):
+        for field in fields:
+            if field not in old[case] or field not in new[case]:
+                continue
+            before, after = old[case][field], new[case][field]
+            change = (after - before) / before * 100 if before else 0
+            lines.append(
+                f'{case} {field}: {before} -> {after} ({change:+.1f}%)'
+            )
+    return lines
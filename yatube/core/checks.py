@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Кеш страниц лент работает только с общим для воркеров кешем."""
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'Кеш по умолчанию живет в памяти процесса: поколения лент '
+        'и блокировки не общие для воркеров.',
+        hint='Задайте memcached или redis через YATUBE_CACHE_BACKEND '
+             'и YATUBE_CACHE_LOCATION.',
+        id='core.W001',
+    )]
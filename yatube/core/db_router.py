@@ -0,0 +1,75 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+SYNCED_KEY = 'replica:synced:{}'
+
+_state = threading.local()
+
+
+def set_replica_reads(enabled):
+    """Включает чтение с реплик для текущего потока."""
+    _state.replica_reads = enabled
+
+
+@contextmanager
+def primary_reads():
+    """Временно читает с основной базы, даже если включены реплики."""
+    previous = getattr(_state, 'replica_reads', False)
+    _state.replica_reads = False
+    try:
+        yield
+    finally:
+        _state.replica_reads = previous
+
+
+def mark_synced(alias, synced_at):
+    """Запоминает, по состоянию на какое время скопирована реплика."""
+    cache.set(SYNCED_KEY.format(alias), synced_at, timeout=None)
+
+
+def replicas_synced_since(moment):
+    """Все реплики скопированы с основной базы не раньше moment."""
+    keys = [SYNCED_KEY.format(alias) for alias in settings.DATABASE_REPLICAS]
+    synced = cache.get_many(keys)
+    return all(synced.get(key, 0) >= moment for key in keys)
+
+
+def pinned_to_primary(request):
+    """Пользователь недавно писал и должен читать с основной базы."""
+    return bool(settings.DATABASE_REPLICAS) and (
+        settings.REPLICA_PIN_COOKIE in request.COOKIES
+    )
+
+
+class ReplicaRouter:
+    """Чтения в режиме set_replica_reads(True) идут на случайную реплику
+    из DATABASE_REPLICAS, все остальное - на основную базу.
+
+    Сессии и пользователи всегда читаются с основной базы: на отстающей
+    реплике нет сессии свежего входа, и пользователя бы разлогинило.
+    """
+
+    primary_app_labels = ('auth', 'sessions')
+
+    def db_for_read(self, model, **hints):
+        if (
+            settings.DATABASE_REPLICAS
+            and getattr(_state, 'replica_reads', False)
+            and model._meta.app_label not in self.primary_app_labels
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схему реплики приносит sync_replica вместе с данными.
+        return db == 'default'
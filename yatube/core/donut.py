@@ -0,0 +1,83 @@
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+HOLE_SALT = 'core.donut'
+HOLE_MARKER = '<!--donut:{}:{}-->'
+HOLE_RE = re.compile(
+    r'<!--donut:([0-9a-f]{40}):([\w./-]+)(?:\?([\w.~%=&+-]*))?-->'
+)
+ANONYMOUS_KEY = 'donut:anonymous:{}:{}:{}'
+
+
+def sign(payload):
+    return salted_hmac(HOLE_SALT, payload).hexdigest()
+
+
+def hole_payload(name, query):
+    return f'{name}?{query}' if query else name
+
+
+def hole_marker(name, params):
+    """Метка фрагмента; параметры шаблона передаются в ней строками.
+
+    Метка подписана SECRET_KEY: текст пользователя, попавший в страницу
+    без экранирования (например, в JSON), не превратится во фрагмент.
+    """
+    payload = hole_payload(name, urlencode(sorted(params.items())))
+    return HOLE_MARKER.format(sign(payload), payload)
+
+
+def is_html(content_type):
+    return content_type.split(';')[0].strip() == 'text/html'
+
+
+def punch_holes(request, enabled=True):
+    """Пока включено, тег donut выводит метку вместо фрагмента."""
+    request.donut_holes = enabled
+
+
+def punching_holes(request):
+    return getattr(request, 'donut_holes', False)
+
+
+def render_hole(name, query, request):
+    # У всех анонимов фрагмент одинаковый в пределах view и языка,
+    # поэтому его не нужно рисовать заново на каждый запрос. Шаблонам
+    # дыр нельзя выводить csrf_token: он попал бы в общий кеш.
+    def render():
+        return render_to_string(name, dict(parse_qsl(query)), request)
+
+    if request.user.is_authenticated:
+        return render()
+    match = request.resolver_match
+    key = ANONYMOUS_KEY.format(
+        f'{name}?{query}',
+        match.view_name if match else '',
+        translation.get_language()
+    )
+    return cache.get_or_set(key, render, settings.FEED_CACHE_TIMEOUT)
+
+
+def fill_holes(content, request):
+    """Заменяет метки фрагментами, отрисованными для этого запроса."""
+    rendered = {}
+
+    def fill(match):
+        marker = match.group(0)
+        signature, name, query = match.groups(default='')
+        if name not in settings.DONUT_TEMPLATES:
+            return marker
+        if not constant_time_compare(
+            signature, sign(hole_payload(name, query))
+        ):
+            return marker
+        if marker not in rendered:
+            rendered[marker] = render_hole(name, query, request)
+        return rendered[marker]
+    return HOLE_RE.sub(fill, content)
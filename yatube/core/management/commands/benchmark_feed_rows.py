@@ -0,0 +1,81 @@
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    compare_results, make_report, measure, read_report, summarize,
+    write_report
+)
+from posts.models import Post
+
+PAGE_SIZES = (10, 100)
+
+
+def full_rows():
+    return Post.objects.select_related('author', 'group')
+
+
+def feed_rows():
+    return Post.objects.feed()
+
+
+QUERYSETS = (('full', full_rows), ('feed', feed_rows))
+
+
+def memory_usage(load):
+    """Сколько КиБ занимают загруженные строки и пик при загрузке."""
+    tracemalloc.start()
+    try:
+        rows = load()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del rows
+    return round(current / 1024, 1), round(peak / 1024, 1)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает память и время загрузки страницы ленты: все поля '
+        'поста, автора и группы против Post.objects.feed()'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--output', default='benchmark_feed_rows.json')
+        parser.add_argument(
+            '--compare', help='Отчет прошлого запуска для сравнения'
+        )
+
+    def handle(self, *args, **options):
+        if not Post.objects.exists():
+            raise CommandError(
+                'Нет данных: сначала запустите generate_dataset'
+            )
+        results = {}
+        for size in PAGE_SIZES:
+            for name, queryset in QUERYSETS:
+                case = f'{name}:{size}'
+                results[case] = self.run_case(queryset, size, options)
+                self.stdout.write(f'{case}: {results[case]}')
+        report = make_report(
+            'feed_rows', results, repeat=options['repeat']
+        )
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+        if options['compare']:
+            old = read_report(options['compare'])
+            for line in compare_results(
+                old['results'], results,
+                fields=('p50_ms', 'p95_ms', 'memory_kb', 'peak_kb')
+            ):
+                self.stdout.write(line)
+
+    def run_case(self, queryset, size, options):
+        def load():
+            return list(queryset()[:size])
+
+        load()
+        memory, peak = memory_usage(load)
+        timings = measure(load, options['repeat'])
+        return {'memory_kb': memory, 'peak_kb': peak, **summarize(timings)}
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, engines
+
+from core.benchmark import (
+    compare_results, make_report, measure, read_report, summarize,
+    write_report
+)
+from posts.models import Post
+
+POSTS_PER_PAGE = 10
+TEMPLATES = ('includes/article.html', 'includes/profile_article.html')
+STORED_BODY = '{{ post.text_html|safe }}'
+# Так тело поста выводилось до появления text_html.
+LEGACY_BODY = '{{ post.text|linebreaksbr }}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает отрисовку страницы постов с HTML, посчитанным при '
+        'записи, и с linebreaksbr на каждый показ'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument(
+            '--paragraphs', type=int, default=1,
+            help='Повторить текст каждого поста абзацами, без записи в БД'
+        )
+        parser.add_argument('--output', default='benchmark_render.json')
+        parser.add_argument(
+            '--compare', help='Отчет прошлого запуска для сравнения'
+        )
+
+    def handle(self, *args, **options):
+        posts = list(
+            Post.objects.select_related('author', 'group')[:POSTS_PER_PAGE]
+        )
+        if not posts:
+            raise CommandError(
+                'Нет данных: сначала запустите generate_dataset'
+            )
+        if options['paragraphs'] > 1:
+            for post in posts:
+                post.text = '\n\n'.join([post.text] * options['paragraphs'])
+                post.prepare_text()
+        engine = engines['django'].engine
+        results = {}
+        for name in TEMPLATES:
+            source = engine.get_template(name).source
+            for case, body in (
+                ('stored', STORED_BODY), ('legacy', LEGACY_BODY)
+            ):
+                template = engine.from_string(
+                    source.replace(STORED_BODY, body)
+                )
+                key = f'{name}:{case}'
+                results[key] = self.run_case(template, posts, options)
+                self.stdout.write(f'{key}: {results[key]}')
+        report = make_report(
+            'render', results,
+            repeat=options['repeat'], paragraphs=options['paragraphs']
+        )
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+        if options['compare']:
+            old = read_report(options['compare'])
+            for line in compare_results(old['results'], results):
+                self.stdout.write(line)
+
+    def run_case(self, template, posts, options):
+        def render_page():
+            return ''.join(
+                template.render(Context({'post': post})) for post in posts
+            )
+
+        size = len(render_page())
+        timings = measure(render_page, options['repeat'])
+        return {'bytes': size, **summarize(timings)}
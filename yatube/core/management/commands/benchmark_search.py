@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    compare_results, make_report, measure, read_report, summarize,
+    write_report
+)
+from posts.models import Post
+from posts.search import TOKEN_RE, search_posts
+
+POSTS_PER_PAGE = 10
+
+
+def like_search(queryset, text):
+    for token in TOKEN_RE.findall(text):
+        queryset = queryset.filter(text__icontains=token)
+    return queryset.order_by('-pub_date')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск постов через LIKE и через индекс FTS5: '
+        'первая страница результатов и их число'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'terms', nargs='*',
+            help='Запросы, по умолчанию слова из первого поста'
+        )
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--output', default='benchmark_search.json')
+        parser.add_argument(
+            '--compare', help='Отчет прошлого запуска для сравнения'
+        )
+
+    def handle(self, *args, **options):
+        terms = options['terms'] or self.default_terms()
+        results = {}
+        for term in terms:
+            for name, search in (('like', like_search), ('fts', search_posts)):
+                case = f'{name}:{term}'
+                results[case] = self.run_case(search, term, options)
+                self.stdout.write(f'{case}: {results[case]}')
+        report = make_report('search', results, repeat=options['repeat'])
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+        if options['compare']:
+            old = read_report(options['compare'])
+            for line in compare_results(old['results'], results):
+                self.stdout.write(line)
+
+    def default_terms(self):
+        text = Post.objects.order_by('id').values_list(
+            'text', flat=True
+        ).first()
+        if text is None:
+            raise CommandError(
+                'Нет данных: сначала запустите generate_dataset'
+            )
+        words = sorted(set(TOKEN_RE.findall(text)), key=len, reverse=True)
+        return words[:2] + [' '.join(words[:2])]
+
+    def run_case(self, search, term, options):
+        def request():
+            queryset = search(Post.objects.all(), term)
+            return queryset.count(), list(queryset[:POSTS_PER_PAGE])
+
+        found, _ = request()
+        timings = measure(request, options['repeat'])
+        return {'found': found, **summarize(timings)}
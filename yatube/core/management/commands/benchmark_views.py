@@ -0,0 +1,130 @@
+import math
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.benchmark import (
+    compare_results, make_report, measure, read_report, summarize,
+    write_report
+)
+from api.urls import urlpatterns as api_urlpatterns
+from posts.models import AuthorCounter, Group, Post
+from posts.urls import urlpatterns as posts_urlpatterns
+from users.urls import urlpatterns as users_urlpatterns
+
+POSTS_PER_PAGE = 10
+FEED_VIEWS = ('posts:index', 'posts:group_list', 'posts:profile')
+LOGIN_VIEWS = (
+    'posts:post_create',
+    'posts:post_edit',
+    'users:password_change',
+    'users:password_change_done',
+)
+# logout разлогинивает клиента, а для сброса пароля нужен живой токен.
+SKIPPED_VIEWS = ('users:logout', 'users:password_reset_confirm')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время ответа, размер и число запросов к БД для всех '
+        'адресов posts, users и api и сохраняет отчет в JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--output', default='benchmark_views.json')
+        parser.add_argument(
+            '--compare', help='Отчет прошлого запуска для сравнения'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кеш перед каждым запросом'
+        )
+
+    def handle(self, *args, **options):
+        author_counter = AuthorCounter.objects.select_related(
+            'author'
+        ).order_by('-posts_count').first()
+        group = Group.objects.order_by('-posts_count').first()
+        if author_counter is None or group is None:
+            raise CommandError(
+                'Нет данных: сначала запустите generate_dataset'
+            )
+        author = author_counter.author
+        self.samples = {
+            'slug': group.slug,
+            'username': author.username,
+            'post_id': author.posts.order_by('-pub_date').first().id,
+        }
+        self.totals = {
+            'posts:index': Post.objects.count(),
+            'posts:group_list': group.posts_count,
+            'posts:profile': author_counter.posts_count,
+        }
+        self.guest = Client()
+        self.user = Client()
+        self.user.force_login(author)
+        results = {}
+        for case, client, url in self.cases():
+            results[case] = self.run_case(client, url, options)
+            self.stdout.write(f'{case}: {results[case]}')
+        report = make_report(
+            'views', results, repeat=options['repeat'], cold=options['cold']
+        )
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+        if options['compare']:
+            old = read_report(options['compare'])
+            for line in compare_results(old['results'], results):
+                self.stdout.write(line)
+
+    def cases(self):
+        for namespace, urlpatterns in (
+            ('posts', posts_urlpatterns),
+            ('users', users_urlpatterns),
+            ('api', api_urlpatterns),
+        ):
+            for pattern in urlpatterns:
+                name = f'{namespace}:{pattern.name}'
+                if name in SKIPPED_VIEWS:
+                    continue
+                kwargs = {
+                    key: self.samples[key]
+                    for key in pattern.pattern.converters
+                }
+                url = reverse(name, kwargs=kwargs)
+                client = self.user if name in LOGIN_VIEWS else self.guest
+                if name not in FEED_VIEWS:
+                    yield name, client, url
+                    continue
+                last = max(1, math.ceil(self.totals[name] / POSTS_PER_PAGE))
+                for page in sorted({1, (last + 1) // 2, last}):
+                    yield f'{name}?page={page}', client, f'{url}?page={page}'
+                    yield (
+                        f'{name}?page={page} [user]',
+                        self.user,
+                        f'{url}?page={page}'
+                    )
+
+    def run_case(self, client, url, options):
+        def request():
+            if options['cold']:
+                cache.clear()
+            return client.get(url)
+
+        request()
+        # Иначе при DEBUG лог запросов сбросится посреди замера.
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        timings = measure(request, options['repeat'])
+        return {
+            'status': response.status_code,
+            'queries': len(queries),
+            'bytes': len(response.content),
+            **summarize(timings),
+        }
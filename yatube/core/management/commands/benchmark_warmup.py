@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmark import make_report, summarize, write_report
+from core.warmup import url_samples, warm_up
+
+FIRST_REQUESTS = (
+    ('posts:index', ()),
+    ('posts:group_list', ('slug',)),
+    ('posts:profile', ('username',)),
+    ('posts:post_detail', ('post_id',)),
+    ('about:author', ()),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку первых запросов в новом процессе '
+        'без прогрева и после core.warmup.warm_up()'
+    )
+    # Проверки заранее загрузили бы адреса и исказили холодный замер.
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', default='benchmark_warmup.json')
+        parser.add_argument(
+            '--child', choices=('cold', 'warm'),
+            help='Служебный режим: один замер в текущем процессе'
+        )
+        parser.add_argument('--url', action='append', dest='urls')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(
+                self.measure(options['child'], options['urls'])
+            ))
+            return
+        url_kwargs = url_samples()
+        urls = [
+            reverse(name, kwargs={key: url_kwargs[key] for key in keys})
+            for name, keys in FIRST_REQUESTS
+        ]
+        samples = {'cold': [], 'warm': []}
+        for _ in range(options['repeat']):
+            for mode in samples:
+                samples[mode].append(self.spawn(mode, urls))
+        results = {}
+        for mode, runs in samples.items():
+            for key in ('first', 'all'):
+                results[f'{mode}:{key}'] = summarize(
+                    [run[key] for run in runs]
+                )
+            results[f'{mode}:warmup'] = summarize(
+                [run['warmup'] for run in runs]
+            )
+            self.stdout.write(
+                f'{mode}: первый запрос {results[f"{mode}:first"]}'
+            )
+        report = make_report('warmup', results, repeat=options['repeat'])
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+
+    def spawn(self, mode, urls):
+        # Адреса считает родитель: в холодном процессе до первого
+        # запроса не должно быть ни запросов к БД, ни reverse().
+        output = subprocess.run(
+            [sys.executable, sys.argv[0], 'benchmark_warmup',
+             '--child', mode]
+            + [f'--url={url}' for url in urls],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def measure(self, mode, urls):
+        started = time.perf_counter()
+        if mode == 'warm':
+            warm_up()
+        warmup = time.perf_counter() - started
+        # Замеряем сам процесс, а не попадания в кеш страниц.
+        cache.clear()
+        client = Client()
+        timings = []
+        for url in urls:
+            started = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - started)
+        return {'warmup': warmup, 'first': timings[0], 'all': sum(timings)}
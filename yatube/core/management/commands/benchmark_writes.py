@@ -0,0 +1,96 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+
+from core.benchmark import make_report, summarize, write_report
+from core.sqlite import retry_on_locked
+from posts.models import Post, User
+
+BENCH_USERNAME = 'bench_writer'
+BENCH_TEXT = 'Пост нагрузочного теста записи'
+# Как база работала до настройки: журнал отката и без повторов.
+BASELINE_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность параллельной записи постов '
+        'без настроек SQLite и с PRAGMA из SQLITE_PRAGMAS и повторами'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument(
+            '--posts', type=int, default=100,
+            help='Сколько постов создает каждый поток'
+        )
+        parser.add_argument('--output', default='benchmark_writes.json')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда сравнивает настройки SQLite')
+        author, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        results = {}
+        try:
+            with override_settings(SQLITE_PRAGMAS=BASELINE_PRAGMAS):
+                results['baseline'] = self.run_profile(
+                    Post.objects.create, author, options
+                )
+            results['tuned'] = self.run_profile(
+                retry_on_locked(Post.objects.create), author, options
+            )
+        finally:
+            Post.objects.filter(author=author, text=BENCH_TEXT).delete()
+        for name, result in results.items():
+            self.stdout.write(f'{name}: {result}')
+        report = make_report(
+            'writes', results,
+            threads=options['threads'], posts=options['posts']
+        )
+        write_report(options['output'], report)
+        self.stdout.write(f'Отчет сохранен в {options["output"]}')
+
+    def run_profile(self, create, author, options):
+        # Новые соединения получат PRAGMA текущего профиля.
+        connection.close()
+        timings = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                for _ in range(options['posts']):
+                    started = time.perf_counter()
+                    try:
+                        create(text=BENCH_TEXT, author=author)
+                    except OperationalError:
+                        with lock:
+                            errors.append(1)
+                        continue
+                    with lock:
+                        timings.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        connection.close()
+        result = {
+            'written': len(timings),
+            'errors': len(errors),
+            'writes_per_s': round(len(timings) / elapsed, 1),
+        }
+        if timings:
+            result.update(summarize(timings))
+        return result
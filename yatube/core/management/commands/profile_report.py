@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import hot_functions, read_stacks
+
+
+class Command(BaseCommand):
+    help = 'Сводит collapsed-стеки профилировщика в топ горячих функций'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=settings.PROFILER_DIR)
+        parser.add_argument('--view', help='Имя адреса, например posts:index')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--output', help='Записать объединенные стеки для flamegraph.pl'
+        )
+
+    def handle(self, *args, **options):
+        stacks = read_stacks(options['dir'], options['view'])
+        if not stacks:
+            raise CommandError(f'В {options["dir"]} нет сэмплов')
+        samples = sum(stacks.values())
+        own, total = hot_functions(stacks)
+        self.stdout.write(f'Сэмплов: {samples}')
+        self.stdout.write(f'{"своих":>8} {"всего":>8}  функция')
+        for name, count in own.most_common(options['top']):
+            self.stdout.write(
+                f'{count / samples:8.1%} {total[name] / samples:8.1%}  {name}'
+            )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                for stack, count in stacks.most_common():
+                    output.write(f'{stack} {count}\n')
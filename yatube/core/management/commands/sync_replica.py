@@ -0,0 +1,60 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db_router import mark_synced
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик через backup API; '
+        'с --interval повторяет копирование, изображая отставание реплики'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', dest='aliases',
+            help='Алиас реплики, по умолчанию все из DATABASE_REPLICAS'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Период копирования в секундах; 0 - скопировать один раз'
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError(
+                'Реплики не настроены: задайте YATUBE_REPLICAS'
+            )
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError('Копирование работает только для SQLite')
+        while True:
+            for alias in aliases:
+                self.sync(source, alias)
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def sync(self, source, alias):
+        replica = connections[alias]
+        # Открытое соединение продолжило бы читать старый снимок.
+        replica.close()
+        source.ensure_connection()
+        # Копия содержит все, что записано до начала копирования.
+        synced_at = time.time()
+        started = time.perf_counter()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            source.connection.backup(target)
+        finally:
+            target.close()
+        mark_synced(alias, synced_at)
+        self.stdout.write(
+            f'{alias}: скопировано за '
+            f'{(time.perf_counter() - started) * 1000:.0f} мс'
+        )
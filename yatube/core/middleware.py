@@ -0,0 +1,208 @@
+import mimetypes
+import os
+import random
+import threading
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .db_router import pinned_to_primary, set_replica_reads
+from .profiling import StackSampler, write_stacks
+from .query_budget import QueryRecorder, check_budget
+
+
+def accept_encoding_weights(header):
+    """Кодировки из Accept-Encoding и их вес q; без q вес равен 1."""
+    weights = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+class QueryBudgetMiddleware:
+    """Сверяет число SQL-запросов с бюджетом view из @query_budget."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode == 'off':
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(recorder)
+                )
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is not None:
+            check_budget(
+                recorder,
+                match.view_name,
+                getattr(match.func, 'query_budget', None),
+                mode
+            )
+        return response
+
+
+class SamplingProfilerMiddleware:
+    """Профилирует долю запросов и запросы с заголовком X-Profile.
+
+    Заголовок учитывается при DEBUG и для сотрудников.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+        with StackSampler(
+            threading.get_ident(), settings.PROFILER_INTERVAL
+        ) as sampler:
+            response = self.get_response(request)
+        match = request.resolver_match
+        write_stacks(
+            settings.PROFILER_DIR,
+            match.view_name if match else 'unresolved',
+            sampler.stacks
+        )
+        return response
+
+    def should_profile(self, request):
+        if 'HTTP_X_PROFILE' in request.META and (
+            settings.DEBUG or request.user.is_staff
+        ):
+            return True
+        return random.random() < settings.PROFILER_SAMPLE_RATE
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтения view из REPLICA_READ_VIEWS на реплики.
+
+    После успешного изменяющего запроса ставит cookie, и пока она жива,
+    пользователь читает с основной базы и видит свои изменения.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            set_replica_reads(False)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in self.safe_methods
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_replica_reads(
+            request.method in ('GET', 'HEAD')
+            and not pinned_to_primary(request)
+            and request.resolver_match.view_name
+            in settings.REPLICA_READ_VIEWS
+        )
+
+
+class PrecompressedStaticMiddleware:
+    """Отдает собранную collectstatic статику из STATIC_ROOT.
+
+    Выбирает .br или .gz копию по Accept-Encoding. Файлы с хешем
+    в имени браузер кеширует навсегда и больше не запрашивает.
+    """
+
+    encodings = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        path = self.static_path(request)
+        if path is None:
+            return self.get_response(request)
+        return self.serve(request, path)
+
+    def static_path(self, request):
+        if (
+            not settings.STATIC_ROOT
+            or request.method not in ('GET', 'HEAD')
+            or not request.path.startswith(settings.STATIC_URL)
+        ):
+            return None
+        try:
+            path = safe_join(
+                settings.STATIC_ROOT, request.path[len(settings.STATIC_URL):]
+            )
+        except SuspiciousFileOperation:
+            return None
+        return path if os.path.isfile(path) else None
+
+    def serve(self, request, path):
+        name = request.path[len(settings.STATIC_URL):]
+        content_type, _ = mimetypes.guess_type(path)
+        weights = accept_encoding_weights(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        # q=0 запрещает кодировку, * задает вес для не названных явно;
+        # при равном весе порядок из encodings.
+        candidates = sorted(
+            (
+                (weights.get(candidate, weights.get('*', 0)), candidate, ext)
+                for candidate, ext in self.encodings
+            ),
+            key=lambda item: -item[0]
+        )
+        encoding = None
+        for weight, candidate, extension in candidates:
+            if weight > 0 and os.path.isfile(path + extension):
+                encoding, path = candidate, path + extension
+                break
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        is_hashed = getattr(staticfiles_storage, 'is_hashed', None)
+        if is_hashed and is_hashed(name):
+            patch_cache_control(
+                response, public=True, immutable=True,
+                max_age=settings.STATIC_MAX_AGE
+            )
+        else:
+            patch_cache_control(
+                response, public=True,
+                max_age=settings.STATIC_UNHASHED_MAX_AGE
+            )
+        return response
@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+
+def frame_name(code):
+    filename = code.co_filename
+    if filename.startswith(settings.BASE_DIR):
+        filename = os.path.relpath(filename, settings.BASE_DIR)
+    else:
+        filename = os.path.basename(filename)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+def collapse(frame):
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Раз в interval секунд снимает стек потока, обрабатывающего запрос."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+
+def write_stacks(directory, view_name, stacks):
+    """Сохраняет стеки в формате collapsed (stackcollapse/flamegraph.pl)."""
+    view_directory = os.path.join(directory, view_name.replace(':', '-'))
+    os.makedirs(view_directory, exist_ok=True)
+    path = os.path.join(
+        view_directory, f'{time.time_ns()}-{os.getpid()}.folded'
+    )
+    with open(path, 'w', encoding='utf-8') as stacks_file:
+        for stack, count in stacks.items():
+            stacks_file.write(f'{stack} {count}\n')
+    return path
+
+
+def read_stacks(directory, view_name=None):
+    stacks = Counter()
+    for root, _, files in os.walk(directory):
+        if view_name and os.path.basename(root) != view_name.replace(':', '-'):
+            continue
+        for name in files:
+            if not name.endswith('.folded'):
+                continue
+            with open(os.path.join(root, name), encoding='utf-8') as lines:
+                for line in lines:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if stack:
+                        stacks[stack] += int(count)
+    return stacks
+
+
+def hot_functions(stacks):
+    """Счетчики собственных и суммарных сэмплов по функциям."""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return own, total
@@ -0,0 +1,74 @@
+import logging
+import os
+import traceback
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'log', 'raise')
+OWN_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'middleware.py'),
+)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """Сколько SQL-запросов разрешено view за один запрос."""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+class QueryRecorder:
+    """Для connection.execute_wrapper: запоминает SQL и место вызова."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, self.origin()))
+        return execute(sql, params, many, context)
+
+    def origin(self):
+        for frame in reversed(traceback.extract_stack()[:-2]):
+            filename = os.path.abspath(frame.filename)
+            if (
+                filename.startswith(settings.BASE_DIR)
+                and filename not in OWN_FILES
+            ):
+                return f'{frame.filename}:{frame.lineno} in {frame.name}'
+        return 'unknown'
+
+    def duplicates(self):
+        origins = defaultdict(list)
+        for sql, origin in self.queries:
+            origins[sql].append(origin)
+        return {
+            sql: places for sql, places in origins.items() if len(places) > 1
+        }
+
+    def report(self, view_name, budget):
+        lines = [
+            f'{view_name}: {len(self.queries)} SQL-запросов '
+            f'при бюджете {budget}'
+        ]
+        for sql, places in self.duplicates().items():
+            lines.append(f'  {len(places)} x {sql}')
+            lines.extend(f'    {place}' for place in sorted(set(places)))
+        return '\n'.join(lines)
+
+
+def check_budget(recorder, view_name, budget, mode):
+    if budget is None or len(recorder.queries) <= budget:
+        return
+    report = recorder.report(view_name, budget)
+    if mode == 'raise':
+        raise QueryBudgetExceeded(report)
+    logger.warning(report)
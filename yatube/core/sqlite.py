@@ -0,0 +1,37 @@
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+
+def apply_pragmas(connection):
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def is_locked_error(error):
+    return 'database is locked' in str(error)
+
+
+def retry_on_locked(func):
+    """Повторяет запись, если SQLite ответил 'database is locked'.
+
+    Паузы растут экспоненциально со случайной добавкой. Внутри
+    внешней транзакции повторять нельзя - ошибка пробрасывается сразу.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        delay = settings.SQLITE_LOCK_BACKOFF
+        for attempt in range(settings.SQLITE_LOCK_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as error:
+                if not is_locked_error(error) or connection.in_atomic_block:
+                    raise
+            time.sleep(delay + random.uniform(0, delay))
+            delay *= 2
+        return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,62 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.txt', '.html', '.json', '.xml', '.ico', '.map'
+)
+
+
+def compress_file(path):
+    """Пишет рядом с файлом .gz и .br, если они меньше исходного."""
+    with open(path, 'rb') as source:
+        content = source.read()
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content)
+    written = []
+    for extension, compressed in variants.items():
+        if len(compressed) < len(content):
+            with open(path + extension, 'wb') as target:
+                target.write(compressed)
+            written.append(path + extension)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Имена с хешем содержимого через манифест и сжатые копии файлов.
+
+    Если файла нет в манифесте (collectstatic не запускали), отдается
+    исходное имя вместо ошибки.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        self.__dict__.pop('hashed_names', None)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                compress_file(self.path(name))
+
+    @cached_property
+    def hashed_names(self):
+        return set(self.hashed_files.values())
+
+    def is_hashed(self, name):
+        return name in self.hashed_names
@@ -0,0 +1,27 @@
+from django import template
+from django.conf import settings
+from django.utils.safestring import mark_safe
+
+from core.donut import hole_marker, punching_holes
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def donut(context, template_name, **params):
+    """Фрагмент, зависящий от пользователя.
+
+    В странице, которая пойдет в общий кеш, на его месте остается метка,
+    и фрагмент отрисовывается отдельно для каждого запроса. Из контекста
+    страницы фрагменту доступны только параметры тега, и в метке они
+    превращаются в строки. Шаблон должен быть в DONUT_TEMPLATES.
+    """
+    if template_name not in settings.DONUT_TEMPLATES:
+        raise template.TemplateSyntaxError(
+            f'Шаблона {template_name} нет в DONUT_TEMPLATES'
+        )
+    if punching_holes(context.get('request')):
+        return mark_safe(hole_marker(template_name, params))
+    fragment = context.template.engine.get_template(template_name)
+    with context.push(**params):
+        return fragment.render(context)
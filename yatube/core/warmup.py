@@ -0,0 +1,150 @@
+"""Прогрев процесса перед fork воркеров.
+
+Вызывается из yatube/wsgi.py, если задана переменная окружения
+YATUBE_WARMUP, и имеет смысл, когда сервер импортирует приложение
+до fork (gunicorn --preload, uWSGI без lazy-apps). Шаблоны
+компилируются один раз, только если включен кеширующий загрузчик:
+при DEBUG = False Django включает его сам.
+"""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template import engines
+from django.test import Client
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import translation
+
+from posts.models import Group, Post
+
+logger = logging.getLogger(__name__)
+
+# Запросы с побочными эффектами или без данных для аргументов адреса.
+SKIPPED_NAMESPACES = ('admin',)
+SKIPPED_NAMES = ('logout',)
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def template_names():
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, files in os.walk(directory):
+                for file_name in files:
+                    if file_name.endswith(TEMPLATE_EXTENSIONS):
+                        yield os.path.relpath(
+                            os.path.join(root, file_name), directory
+                        ).replace(os.sep, '/')
+
+
+def compile_templates():
+    names = set(template_names())
+    for name in names:
+        try:
+            engines['django'].get_template(name)
+        except Exception:
+            logger.exception('Шаблон %s не компилируется', name)
+    return len(names)
+
+
+def url_patterns(resolver=None, namespace=None):
+    """Пары (имя адреса, паттерн) по всему дереву URL."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in SKIPPED_NAMESPACES:
+                continue
+            inner = ':'.join(filter(None, (namespace, pattern.namespace)))
+            yield from url_patterns(pattern, inner or None)
+        elif pattern.name:
+            name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+            yield name, pattern
+
+
+def populate_resolver():
+    resolver = get_resolver()
+    # Обращение к reverse_dict заполняет таблицы разрешения адресов.
+    resolver.reverse_dict
+    return sum(1 for _ in url_patterns(resolver))
+
+
+def load_translations():
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.gettext('Пусто')
+    translation.deactivate()
+    return 1
+
+
+def url_samples():
+    post = Post.objects.values(
+        'id', 'author__username'
+    ).order_by('-pub_date').first()
+    slug = Group.objects.values_list('slug', flat=True).first()
+    samples = {'slug': slug}
+    if post:
+        samples.update(
+            post_id=post['id'], username=post['author__username']
+        )
+    return {key: value for key, value in samples.items() if value}
+
+
+def synthetic_requests():
+    samples = url_samples()
+    client = Client()
+    done = set()
+    for name, pattern in url_patterns():
+        if name.rsplit(':', 1)[-1] in SKIPPED_NAMES or name in done:
+            continue
+        converters = pattern.pattern.converters
+        if any(key not in samples for key in converters):
+            continue
+        url = reverse(
+            name, kwargs={key: samples[key] for key in converters}
+        )
+        try:
+            client.get(url)
+        except Exception:
+            logger.exception('Прогревочный запрос к %s упал', url)
+        done.add(name)
+    return len(done)
+
+
+STEPS = (
+    ('templates', compile_templates),
+    ('resolver', populate_resolver),
+    ('translations', load_translations),
+    ('requests', synthetic_requests),
+)
+
+
+def warm_up():
+    """Прогревает процесс и закрывает соединения с БД и кешем перед fork.
+
+    Упавший шаг пишется в лог и пропускается: прогрев не должен мешать
+    запуску сервера, например, если миграции еще не применены.
+    """
+    report = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        try:
+            count = step()
+        except Exception:
+            logger.exception('Шаг прогрева %s упал', name)
+            count = None
+        report[name] = {
+            'count': count,
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+    try:
+        # Соединение SQLite нельзя делить между процессами после fork.
+        connections.close_all()
+        # Сокеты клиентов memcached и redis тоже не делим между
+        # процессами.
+        for cache in caches.all():
+            cache.close()
+    except Exception:
+        logger.exception('Не удалось закрыть соединения после прогрева')
+    logger.info('Прогрев завершен: %s', report)
+    return report
@@ -1,6 +1,54 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.forms.utils import flatatt
+from django.http import StreamingHttpResponse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 
+from .cache import feed_count_key, feed_generation, index_feed
+from .exports import CONTENT_TYPES, export_lines
 from .models import Post, Group
+from .paginators import FeedPaginator, estimate_count, queryset_count_key
+from .search import search_posts
+
+
+def export_action(file_format):
+    def action(modeladmin, request, queryset):
+        response = StreamingHttpResponse(
+            export_lines(queryset, file_format),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="posts.{file_format}"'
+        )
+        return response
+
+    action.__name__ = f'export_{file_format}'
+    action.short_description = f'Выгрузить выбранные посты в {file_format}'
+    return action
+
+
+class SharedOptionsSelect(forms.Select):
+    """Select с готовым HTML вариантов: шаблон option не рендерится
+    заново для каждой строки changelist."""
+
+    def __init__(self, options_html, attrs=None, choices=()):
+        super().__init__(attrs, choices)
+        self.options_html = options_html
+
+    def render(self, name, value, attrs=None, renderer=None):
+        final_attrs = self.build_attrs(self.attrs, attrs)
+        final_attrs['name'] = name
+        option = format_html(
+            '<option value="{}">', '' if value is None else value
+        )
+        options = self.options_html.replace(
+            option, option[:-1] + ' selected>', 1
+        )
+        return format_html(
+            '<select{}>{}</select>', flatatt(final_attrs), mark_safe(options)
+        )
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -9,10 +57,64 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    actions = (export_action('csv'), export_action('jsonl'))
+    list_select_related = ('author', 'group')
+    date_hierarchy = 'pub_date'
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        count = count_key = None
+        if queryset.query.where:
+            # Любое изменение постов сбрасывает поколение главной ленты,
+            # вместе с ним меняются и ключи чисел отфильтрованных списков.
+            count_key = queryset_count_key(
+                queryset, feed_generation(index_feed())
+            )
+        else:
+            # Без фильтров на большой таблице хватает оценки, на малой
+            # число постов совпадает с главной лентой.
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                count = estimate
+            else:
+                count_key = feed_count_key(index_feed())
+        return FeedPaginator(
+            queryset, per_page, count=count, count_key=count_key,
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page,
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'group':
+            choices, options_html = self.group_choices(request, formfield)
+            formfield.choices = choices
+            formfield.widget = SharedOptionsSelect(
+                options_html, choices=choices
+            )
+        return formfield
+
+    def group_choices(self, request, formfield):
+        # Один список на запрос: его делят все строки changelist.
+        if not hasattr(request, '_group_choices'):
+            choices = [('', formfield.empty_label)] + list(
+                Group.objects.order_by('title').values_list('id', 'title')
+            )
+            request._group_choices = choices, format_html_join(
+                '', '<option value="{}">{}</option>', choices
+            )
+        return request._group_choices
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
 
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'title', 'slug', 'description',)
+    list_display = ('pk', 'title', 'slug', 'description', 'posts_count',)
     prepopulated_fields = {"slug": ("title",)}
 
 
@@ -0,0 +1,379 @@
+import hashlib
+import math
+import random
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from core.db_router import primary_reads, replicas_synced_since
+from core.donut import fill_holes, is_html, punch_holes
+
+from .models import Post
+
+GENERATION_KEY = 'feed:generation:{}'
+MODIFIED_KEY = 'feed:modified:{}'
+POST_FEEDS_KEY = 'post:feeds:{}'
+PAGE_KEY = 'feed:page:{}:{}:{}'
+LOCK_KEY = '{}:lock'
+COUNT_KEY = 'feed:count:{}:{}'
+STATS_KEY = 'feed:stats:{}'
+STATS_EVENTS = ('hit', 'miss', 'refresh', 'stale', 'wait')
+
+
+def index_feed():
+    return 'index'
+
+
+def group_feed(slug):
+    return f'group:{slug}'
+
+
+def profile_feed(username):
+    return f'profile:{username}'
+
+
+def post_feed(post_id):
+    return f'post:{post_id}'
+
+
+def post_feeds(post_id):
+    """Ленты, от которых зависит страница поста; None, если поста нет."""
+    key = POST_FEEDS_KEY.format(post_id)
+    feeds = cache.get(key)
+    if feeds is None:
+        # Запись хранится бессрочно, отстающая реплика ее не пишет.
+        with primary_reads():
+            owners = Post.objects.filter(pk=post_id).values_list(
+                'author__username', 'group__slug'
+            ).first()
+        if owners is None:
+            return None
+        username, slug = owners
+        feeds = [post_feed(post_id), profile_feed(username)]
+        if slug is not None:
+            feeds.append(group_feed(slug))
+        cache.set(key, feeds, timeout=None)
+    return feeds
+
+
+def forget_post_feeds(post_id):
+    cache.delete(POST_FEEDS_KEY.format(post_id))
+
+
+def _new_generation():
+    # Поколение начинается с текущего времени: если ключ вытеснят из кеша,
+    # новые номера не совпадут с номерами уже сохраненных страниц.
+    return int(time.time() * 1000000)
+
+
+def feed_generation(feed, timeout=None):
+    return cache.get_or_set(
+        GENERATION_KEY.format(feed), _new_generation, timeout=timeout
+    )
+
+
+def feed_count_key(feed):
+    return COUNT_KEY.format(feed, feed_generation(feed))
+
+
+def feed_last_modified(feed):
+    # Время последнего сброса ленты; None, если лента еще не
+    # подтверждена ответом 200 или ключ вытеснен.
+    return cache.get(MODIFIED_KEY.format(feed))
+
+
+def confirm_feeds(feeds):
+    """Делает ключи поколения и времени сброса лент бессрочными.
+
+    Вызывается после ответа 200. До этого поколение живет
+    FEED_LOCK_TIMEOUT секунд: адреса несуществующих групп и авторов
+    не оставляют в кеше вечных ключей.
+    """
+    for feed in feeds:
+        key = GENERATION_KEY.format(feed)
+        if not cache.touch(key, None):
+            cache.add(key, _new_generation(), timeout=None)
+        cache.add(MODIFIED_KEY.format(feed), time.time(), timeout=None)
+
+
+def feed_validators(feeds):
+    """Поколения и время сброса подтвержденных лент; None, если хотя бы
+    одна лента не подтверждена."""
+    keys = [GENERATION_KEY.format(feed) for feed in feeds]
+    keys += [MODIFIED_KEY.format(feed) for feed in feeds]
+    values = cache.get_many(keys)
+    if len(values) < len(keys):
+        return None
+    return (
+        [values[GENERATION_KEY.format(feed)] for feed in feeds],
+        max(values[MODIFIED_KEY.format(feed)] for feed in feeds),
+    )
+
+
+def _bump(feeds):
+    for feed in feeds:
+        key = GENERATION_KEY.format(feed)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), timeout=None)
+    now = time.time()
+    cache.set_many(
+        {MODIFIED_KEY.format(feed): now for feed in feeds}, timeout=None
+    )
+
+
+def bump_feeds(*feeds):
+    feeds = set(feeds)
+    _bump(feeds)
+    # Повторно сбрасываем после коммита, чтобы страница, собранная
+    # параллельным запросом до коммита, не осталась в новом поколении.
+    transaction.on_commit(lambda: _bump(feeds))
+
+
+def count_event(event):
+    key = STATS_KEY.format(event)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    keys = {STATS_KEY.format(event): event for event in STATS_EVENTS}
+    values = cache.get_many(list(keys))
+    return {event: values.get(key, 0) for key, event in keys.items()}
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_KEY.format(event) for event in STATS_EVENTS])
+
+
+def as_feeds(feeds):
+    return [feeds] if isinstance(feeds, str) else feeds
+
+
+def page_cache_key(request, view_name, feeds):
+    # Поколение неподтвержденной ленты временное, см. confirm_feeds.
+    versions = '\n'.join(
+        f'{feed}={feed_generation(feed, settings.FEED_LOCK_TIMEOUT)}'
+        for feed in feeds
+    )
+    return PAGE_KEY.format(
+        view_name,
+        hashlib.md5(versions.encode()).hexdigest(),
+        hashlib.md5(request.get_full_path().encode()).hexdigest()
+    )
+
+
+def _expires_early(entry):
+    # Вероятностное досрочное обновление (XFetch): чем ближе конец срока
+    # и чем дольше страница считалась, тем вероятнее обновить ее заранее,
+    # и записи не истекают у всех воркеров одновременно.
+    fresh_until, duration = entry[2], entry[3]
+    return time.time() - duration * settings.FEED_EARLY_EXPIRY_BETA * (
+        math.log(1 - random.random())
+    ) >= fresh_until
+
+
+def _wait_for_entry(key, lock_key):
+    """Ждет, пока страницу сохранит запрос, взявший блокировку."""
+    deadline = time.monotonic() + settings.FEED_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(settings.FEED_LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(lock_key) is None:
+            return None
+    return None
+
+
+def _cached_response(entry, request, event):
+    content, content_type = entry[:2]
+    if is_html(content_type):
+        content = fill_holes(content, request)
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Feed-Cache'] = event
+    return response
+
+
+def _reads_for(feeds):
+    # Реплика, скопированная до последнего сброса лент, положила бы
+    # старую страницу в новое поколение. Время сброса неизвестно -
+    # читаем с основной базы.
+    modified = [feed_last_modified(feed) for feed in feeds]
+    if None not in modified and replicas_synced_since(max(modified)):
+        return nullcontext()
+    return primary_reads()
+
+
+def _render_page(view, request, args, kwargs, key, feeds):
+    started = time.monotonic()
+    punch_holes(request)
+    try:
+        response = view(request, *args, **kwargs)
+    finally:
+        punch_holes(request, False)
+    if response.streaming:
+        return response
+    content = response.content.decode(response.charset)
+    if response.status_code == 200:
+        confirm_feeds(feeds)
+        # Страница хранится дольше срока свежести: пока ее пересчитывает
+        # один запрос, остальные получают устаревшую копию.
+        cache.set(
+            key,
+            (
+                content,
+                response['Content-Type'],
+                time.time() + settings.FEED_CACHE_TIMEOUT,
+                time.monotonic() - started,
+            ),
+            settings.FEED_CACHE_TIMEOUT + settings.FEED_STALE_TIMEOUT
+        )
+        response['X-Feed-Cache'] = 'miss'
+    if is_html(response['Content-Type']):
+        response.content = fill_holes(content, request)
+    return response
+
+
+def cache_feed_page(feed_for):
+    """Кеширует страницу по поколениям лент, от которых она зависит.
+
+    feed_for получает аргументы view и возвращает имя ленты, список лент
+    или None, если кешировать нельзя. В кеш идет общая для всех страница
+    с метками вместо фрагментов из тега donut, фрагменты отрисовываются
+    для каждого запроса.
+
+    Пересчитывает страницу один запрос, взявший блокировку: остальные
+    получают устаревшую копию, а если копии нет - ждут его результата.
+    Если реплики скопированы до последнего сброса лент, страница
+    считается по основной базе.
+    """
+    def decorator(view):
+        # Ленты syndication - экземпляры Feed, у них нет __name__.
+        view_name = getattr(view, '__name__', type(view).__name__)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            feeds = feed_for(**kwargs)
+            if feeds is None:
+                return view(request, *args, **kwargs)
+            feeds = as_feeds(feeds)
+            key = page_cache_key(request, view_name, feeds)
+            lock_key = LOCK_KEY.format(key)
+            entry = cache.get(key)
+            if entry is not None and not _expires_early(entry):
+                count_event('hit')
+                return _cached_response(entry, request, 'hit')
+            locked = cache.add(lock_key, 1, settings.FEED_LOCK_TIMEOUT)
+            if not locked:
+                if entry is None:
+                    event = 'wait'
+                    count_event(event)
+                    entry = _wait_for_entry(key, lock_key)
+                else:
+                    event = 'stale' if time.time() >= entry[2] else 'hit'
+                    count_event(event)
+                if entry is not None:
+                    return _cached_response(entry, request, event)
+            count_event('miss' if entry is None else 'refresh')
+            try:
+                with _reads_for(feeds):
+                    return _render_page(
+                        view, request, args, kwargs, key, feeds
+                    )
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+        return wrapper
+    return decorator
+
+
+def _validators(feeds_for, kwargs):
+    feeds = as_feeds(feeds_for(**kwargs))
+    if feeds is None:
+        return None
+    found = feed_validators(feeds)
+    return None if found is None else (feeds, *found)
+
+
+def _page_etag(request, feeds_for, kwargs):
+    found = _validators(feeds_for, kwargs)
+    if found is None:
+        return None
+    feeds, generations, _ = found
+    parts = [request.get_full_path(), str(request.user.pk)] + [
+        f'{feed}={generation}' for feed, generation in zip(feeds, generations)
+    ]
+    return hashlib.md5('\n'.join(parts).encode()).hexdigest()
+
+
+def _page_last_modified(request, feeds_for, kwargs):
+    # Время не зависит от пользователя: после входа браузер с одним
+    # If-Modified-Since получил бы 304 и оставил старую шапку.
+    if request.user.is_authenticated:
+        return None
+    found = _validators(feeds_for, kwargs)
+    if found is None:
+        return None
+    return datetime.fromtimestamp(found[2], timezone.utc)
+
+
+def _add_validators(request, response, feeds_for, kwargs):
+    feeds = as_feeds(feeds_for(**kwargs))
+    if feeds is None:
+        return
+    confirm_feeds(feeds)
+    tag = _page_etag(request, feeds_for, kwargs)
+    if tag is not None:
+        response['ETag'] = quote_etag(tag)
+    modified = _page_last_modified(request, feeds_for, kwargs)
+    if modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(modified.timestamp())
+
+
+def conditional_feed(feeds_for):
+    """Отвечает 304 Not Modified по ETag и Last-Modified лент страницы.
+
+    feeds_for получает аргументы view и возвращает имя ленты, список
+    лент или None, если валидаторы посчитать нельзя. Валидаторы
+    появляются после первого ответа 200 для ленты. В ETag входит
+    пользователь: в шапке страницы его имя; вошедшим Last-Modified
+    не отдается.
+    """
+    def etag(request, *args, **kwargs):
+        return _page_etag(request, feeds_for, kwargs)
+
+    def last_modified(request, *args, **kwargs):
+        return _page_last_modified(request, feeds_for, kwargs)
+
+    def decorator(view):
+        conditional_view = condition(etag, last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Валидаторы есть только у лент, для которых уже был ответ
+            # 200: иначе выдуманный адрес получил бы 304 вместо 404.
+            if response.status_code == 200 and not response.has_header(
+                'ETag'
+            ):
+                _add_validators(request, response, feeds_for, kwargs)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
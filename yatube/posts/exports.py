@@ -0,0 +1,69 @@
+import csv
+import json
+
+from .models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author__username', 'group__slug')
+EXPORT_HEADERS = ('id', 'text', 'pub_date', 'author', 'group')
+CHUNK_SIZE = 2000
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def filter_posts(queryset=None, group=None, author=None, since=None,
+                 until=None):
+    queryset = Post.objects.all() if queryset is None else queryset
+    if group:
+        queryset = queryset.filter(group__slug=group)
+    if author:
+        queryset = queryset.filter(author__username=author)
+    if since:
+        queryset = queryset.filter(pub_date__gte=since)
+    if until:
+        queryset = queryset.filter(pub_date__lt=until)
+    return queryset
+
+
+def iter_posts(queryset, chunk_size=CHUNK_SIZE):
+    """Строки постов порциями по id: каждый запрос короткий и не держит
+    чтение открытым на всю выгрузку."""
+    rows = queryset.order_by('id').values_list(*EXPORT_FIELDS)
+    last_id = 0
+    while True:
+        count = 0
+        for row in rows.filter(id__gt=last_id)[:chunk_size].iterator(
+            chunk_size=chunk_size
+        ):
+            count += 1
+            last_id = row[0]
+            yield dict(zip(EXPORT_HEADERS, row))
+        if count < chunk_size:
+            return
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(posts):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADERS)
+    for post in posts:
+        post['pub_date'] = post['pub_date'].isoformat()
+        yield writer.writerow(post.values())
+
+
+def jsonl_lines(posts):
+    for post in posts:
+        post['pub_date'] = post['pub_date'].isoformat()
+        yield json.dumps(post, ensure_ascii=False) + '\n'
+
+
+WRITERS = {'csv': csv_lines, 'jsonl': jsonl_lines}
+
+
+def export_lines(queryset, file_format, chunk_size=CHUNK_SIZE):
+    return WRITERS[file_format](iter_posts(queryset, chunk_size))
@@ -0,0 +1,126 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from core.query_budget import query_budget
+
+from .cache import (
+    cache_feed_page, conditional_feed, group_feed, index_feed, profile_feed
+)
+from .models import Group, Post, User, profile_url
+
+FEED_POSTS = 20
+
+
+class PostFeed(Feed):
+    """Общая часть лент: элементы - посты с автором и группой."""
+
+    def __call__(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        # Last-Modified ставит conditional_feed по времени сброса ленты:
+        # время новейшего поста отличалось бы у промаха и попадания в кеш.
+        del response['Last-Modified']
+        return response
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related(
+            'author', 'group'
+        )[:FEED_POSTS]
+
+    def item_title(self, post):
+        return str(post)
+
+    def item_description(self, post):
+        return post.text
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.edited
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        return (post.group.title,) if post.group else ()
+
+
+class IndexFeed(PostFeed):
+    title = 'Yatube: последние записи'
+    description = 'Последние обновления на сайте'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupFeed(PostFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def get_posts(self, group):
+        return group.posts.all()
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return group.get_absolute_url()
+
+
+class ProfileFeed(PostFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, author):
+        return author.posts.all()
+
+    def title(self, author):
+        return f'Yatube: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Записи пользователя {author.username}'
+
+    def link(self, author):
+        return profile_url(author)
+
+
+class AtomIndexFeed(IndexFeed):
+    feed_type = Atom1Feed
+    subtitle = IndexFeed.description
+
+
+class AtomGroupFeed(GroupFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return self.description(group)
+
+
+class AtomProfileFeed(ProfileFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
+
+
+def feed_view(feed_class, feed_for):
+    """Лента с кешем по поколению и ответом 304, как у HTML-страниц."""
+    return query_budget(4)(
+        conditional_feed(feed_for)(cache_feed_page(feed_for)(feed_class()))
+    )
+
+
+index_rss = feed_view(IndexFeed, index_feed)
+index_atom = feed_view(AtomIndexFeed, index_feed)
+group_rss = feed_view(GroupFeed, group_feed)
+group_atom = feed_view(AtomGroupFeed, group_feed)
+profile_rss = feed_view(ProfileFeed, profile_feed)
+profile_atom = feed_view(AtomProfileFeed, profile_feed)
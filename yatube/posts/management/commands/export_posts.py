@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from posts.exports import CHUNK_SIZE, WRITERS, export_lines, filter_posts
+
+
+def date_argument(value):
+    parsed = parse_date(value)
+    if parsed is None:
+        raise CommandError(f'Неверная дата: {value}')
+    return timezone.make_aware(datetime.combine(parsed, time.min))
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты в CSV или JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=WRITERS, default='jsonl')
+        parser.add_argument('--group', help='slug группы')
+        parser.add_argument('--author', help='username автора')
+        parser.add_argument(
+            '--since', type=date_argument, help='С даты, ГГГГ-ММ-ДД'
+        )
+        parser.add_argument(
+            '--until', type=date_argument, help='До даты, не включая ее'
+        )
+        parser.add_argument('--output', help='Файл, по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = filter_posts(
+            group=options['group'],
+            author=options['author'],
+            since=options['since'],
+            until=options['until'],
+        )
+        lines = export_lines(
+            queryset, options['format'], options['chunk_size']
+        )
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as output:
+            output.writelines(lines)
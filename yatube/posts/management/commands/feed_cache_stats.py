@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает попадания и промахи кеша страниц лент, ответы '
+        'устаревшей копией и ожидания блокировки пересчета'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Обнулить счетчики'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        total = stats['hit'] + stats['miss']
+        ratio = stats['hit'] / total if total else 0
+        self.stdout.write(
+            f'Попаданий: {stats["hit"]}, промахов: {stats["miss"]}, '
+            f'доля попаданий: {ratio:.1%}'
+        )
+        self.stdout.write(
+            f'Обновлений: {stats["refresh"]}, '
+            f'устаревших ответов: {stats["stale"]}, '
+            f'ожиданий блокировки: {stats["wait"]}'
+        )
+        if options['reset']:
+            reset_cache_stats()
@@ -0,0 +1,131 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from faker import Faker
+
+from posts.imports import bulk_create_dated
+from posts.models import Group, Post, User
+
+TEXT_POOL_SIZE = 2000
+
+
+def zipf_weights(size, skew):
+    return list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Создает воспроизводимый набор пользователей, групп и постов '
+        'с неравномерным распределением постов по авторам и группам'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель закона Ципфа для выбора автора и группы'
+        )
+        parser.add_argument(
+            '--without-group', type=float, default=0.3,
+            help='Доля постов без группы'
+        )
+        parser.add_argument(
+            '--days', type=int, default=3 * 365,
+            help='За сколько последних дней раскидать даты публикации'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--prefix', default='bench',
+            help='Префикс имен пользователей и адресов групп'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+        author_ids = self.create_users(options['users'], options['prefix'])
+        group_ids = self.create_groups(options['groups'], options['prefix'])
+        self.create_posts(options, author_ids, group_ids)
+        self.stdout.write(
+            f'Создано пользователей: {len(author_ids)}, '
+            f'групп: {len(group_ids)}, постов: {options["posts"]} '
+            f'за {time.perf_counter() - started:.1f} с'
+        )
+
+    def create_users(self, count, prefix):
+        password = make_password(None)
+        users = (
+            User(
+                username=f'{prefix}_{number}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                password=password,
+            )
+            for number in range(count)
+        )
+        User.objects.bulk_create(users)
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}_'
+        ).order_by('id').values_list('id', flat=True))
+
+    def create_groups(self, count, prefix):
+        groups = (
+            Group(
+                title=self.fake.catch_phrase()[:200],
+                slug=f'{prefix}-{number}',
+                description=self.fake.paragraph(),
+            )
+            for number in range(count)
+        )
+        Group.objects.bulk_create(groups)
+        return list(Group.objects.filter(
+            slug__startswith=f'{prefix}-'
+        ).order_by('id').values_list('id', flat=True))
+
+    def create_posts(self, options, author_ids, group_ids):
+        texts = [
+            self.fake.paragraph(nb_sentences=self.rng.randint(1, 8))
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        # Популярность не должна совпадать с порядком создания.
+        self.rng.shuffle(author_ids)
+        self.rng.shuffle(group_ids)
+        author_weights = zipf_weights(len(author_ids), options['skew'])
+        group_weights = zipf_weights(len(group_ids), options['skew'])
+        now = timezone.now()
+        period = timedelta(days=options['days']).total_seconds()
+        remaining = options['posts']
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            authors = self.rng.choices(
+                author_ids, cum_weights=author_weights, k=size
+            )
+            groups = self.rng.choices(
+                group_ids, cum_weights=group_weights, k=size
+            ) if group_ids else [None] * size
+            bulk_create_dated(
+                Post(
+                    text=self.rng.choice(texts),
+                    author_id=author_id,
+                    group_id=(
+                        None
+                        if self.rng.random() < options['without_group']
+                        else group_id
+                    ),
+                    pub_date=now - timedelta(
+                        seconds=self.rng.uniform(0, period)
+                    ),
+                )
+                for author_id, group_id in zip(authors, groups)
+            )
+            remaining -= size
@@ -0,0 +1,156 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.imports import bulk_create_dated
+from posts.models import Group, Post, User
+
+
+def read_jsonl(source):
+    """Строки JSONL; вместо битой строки - None, чтобы не сбить счет
+    строк для контрольной точки."""
+    for line in source:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def read_csv(source):
+    yield from csv.DictReader(source)
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+def batches(rows, size):
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует посты из JSONL или CSV с полями text, '
+        'author (username), group (slug) и pub_date'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=READERS,
+            help='Формат файла, по умолчанию по расширению'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--batches-per-transaction', type=int, default=10,
+            help='Сколько пачек вставлять в одной транзакции'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки, по умолчанию <path>.checkpoint'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить с последней контрольной точки'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1][1:]
+        if file_format not in READERS:
+            raise CommandError('Укажите --format jsonl или csv')
+        self.checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        done = self.read_checkpoint() if options['resume'] else 0
+        self.authors = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.imported = self.skipped = 0
+        started = time.perf_counter()
+        with open(path, encoding='utf-8', newline='') as source:
+            rows = islice(READERS[file_format](source), done, None)
+            chunk_rows = options['batch_size'] * options[
+                'batches_per_transaction'
+            ]
+            for chunk in batches(rows, chunk_rows):
+                with transaction.atomic():
+                    for batch in batches(iter(chunk), options['batch_size']):
+                        self.import_batch(batch)
+                done += len(chunk)
+                self.write_checkpoint(done)
+                self.report(done, started)
+        self.stdout.write(
+            f'Готово: импортировано {self.imported}, '
+            f'пропущено {self.skipped}'
+        )
+
+    def import_batch(self, rows):
+        posts = []
+        for row in rows:
+            post = self.build_post(row)
+            if post is None:
+                self.skipped += 1
+            else:
+                posts.append(post)
+        bulk_create_dated(posts)
+        self.imported += len(posts)
+
+    def build_post(self, row):
+        # Битые строки не прерывают импорт, а считаются пропущенными.
+        if not isinstance(row, dict) or not isinstance(row.get('text'), str):
+            return None
+        try:
+            author_id = self.authors.get(row.get('author'))
+            group_slug = row.get('group') or None
+            group_id = self.groups.get(group_slug)
+            pub_date = parse_datetime(row.get('pub_date') or '')
+        except (TypeError, ValueError):
+            return None
+        if (
+            not row['text']
+            or author_id is None
+            or (group_slug and group_id is None)
+        ):
+            return None
+        if pub_date is None:
+            pub_date = timezone.now()
+        elif timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        return Post(
+            text=row['text'],
+            author_id=author_id,
+            group_id=group_id,
+            pub_date=pub_date,
+        )
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint, encoding='utf-8') as checkpoint:
+                return json.load(checkpoint)['rows']
+        except FileNotFoundError:
+            return 0
+
+    def write_checkpoint(self, rows):
+        # Запись через временный файл: после сбоя точка остается целой.
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'rows': rows}, checkpoint)
+        os.replace(temporary, self.checkpoint)
+
+    def report(self, done, started):
+        elapsed = time.perf_counter() - started
+        rate = self.imported / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Обработано строк: {done}, импортировано: {self.imported}, '
+            f'{rate:.0f} строк/с'
+        )
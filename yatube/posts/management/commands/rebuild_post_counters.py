@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from posts.models import AuthorCounter, Group, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает с нуля счетчики постов авторов и групп'
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by()
+        group_totals = posts.filter(group=OuterRef('pk')).values(
+            'group'
+        ).annotate(total=Count('id')).values('total')
+        with transaction.atomic():
+            AuthorCounter.objects.all().delete()
+            authors = AuthorCounter.objects.bulk_create(
+                AuthorCounter(
+                    author_id=row['author'], posts_count=row['total']
+                )
+                for row in posts.values('author').annotate(total=Count('id'))
+            )
+            groups = Group.objects.update(posts_count=Coalesce(
+                Subquery(group_totals, output_field=IntegerField()),
+                Value(0)
+            ))
+        self.stdout.write(
+            f'Пересчитано авторов: {len(authors)}, групп: {groups}'
+        )
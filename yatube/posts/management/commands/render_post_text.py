@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.cache import bump_feeds
+from posts.models import Post
+from posts.signals import owner_feeds
+from posts.text import BACKFILL_CHUNK_SIZE, backfill_rendered_text
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново считает HTML и начало текста постов пачками, '
+        'например после изменения правил отрисовки'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=BACKFILL_CHUNK_SIZE
+        )
+        parser.add_argument(
+            '--missing-only', action='store_true',
+            help='Только посты, у которых HTML еще не посчитан'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        done = 0
+        for done, changed in backfill_rendered_text(
+            Post, options['chunk_size'], options['missing_only']
+        ):
+            if changed:
+                # bulk_update не меняет edited: страницы лент со старым
+                # HTML сбрасываются вместе с поколением лент.
+                bump_feeds(*owner_feeds(
+                    {post.author_id for post in changed},
+                    {post.group_id for post in changed},
+                ))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Обработано постов: {done}, {done / elapsed:.0f} постов/с'
+            )
+        self.stdout.write(f'Готово: обработано {done}')
@@ -0,0 +1,55 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:33
+
+import importlib
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+fts = importlib.import_module('posts.migrations.0014_post_fts')
+# SQLite добавляет поля, пересоздавая таблицу, и теряет триггеры FTS.
+recreate_fts = fts.run_sqlite(fts.DROP_SQL + fts.CREATE_SQL)
+
+
+# Копия правил отрисовки на момент миграции: код приложения может
+# измениться, а миграция должна считать так же.
+EXCERPT_LENGTH = 30
+CHUNK_SIZE = 2000
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    queryset = Post.objects.order_by('pk').only('pk', 'text')
+    last_pk = 0
+    while True:
+        posts = list(queryset.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+        if not posts:
+            return
+        for post in posts:
+            post.text_html = str(linebreaksbr(post.text, autoescape=True))
+            post.excerpt = Truncator(post.text).chars(EXCERPT_LENGTH)
+        Post.objects.bulk_update(posts, ('text_html', 'excerpt'))
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, recreate_fts),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=30, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст поста в HTML'),
+        ),
+        migrations.RunPython(recreate_fts, migrations.RunPython.noop),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,104 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.dispatch import Signal
 from django.contrib.auth import get_user_model
 
+from core.reverse import cached_reverse
+
+from .text import EXCERPT_LENGTH, make_excerpt, render_text
+
 
 LIMIT = 15
 
 User = get_user_model()
 
+posts_bulk_created = Signal(providing_args=['posts'])
+
+
+def _ids_by_delta(deltas):
+    ids_by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            ids_by_delta[delta].append(pk)
+    return ids_by_delta
+
+
+def change_post_counters(author_deltas, group_deltas):
+    author_ids = [pk for pk, delta in author_deltas.items() if delta]
+    with transaction.atomic():
+        existing = set(AuthorCounter.objects.filter(
+            author_id__in=author_ids
+        ).values_list('author_id', flat=True))
+        missing = [pk for pk in author_ids if pk not in existing]
+        if missing:
+            # Нет строки счетчика - считаем посты автора заново.
+            AuthorCounter.objects.bulk_create(
+                [
+                    AuthorCounter(
+                        author_id=row['author'], posts_count=row['total']
+                    )
+                    for row in Post.objects.filter(
+                        author_id__in=missing
+                    ).order_by().values('author').annotate(total=Count('id'))
+                ],
+                ignore_conflicts=True
+            )
+        existing_deltas = {pk: author_deltas[pk] for pk in existing}
+        for delta, ids in _ids_by_delta(existing_deltas).items():
+            AuthorCounter.objects.filter(author_id__in=ids).update(
+                posts_count=F('posts_count') + delta
+            )
+        for delta, ids in _ids_by_delta(group_deltas).items():
+            Group.objects.filter(pk__in=ids).update(
+                posts_count=F('posts_count') + delta
+            )
+
+
+def profile_url(author):
+    """Адрес профиля: у модели пользователя нет своего get_absolute_url."""
+    return cached_reverse('posts:profile', 'username', author.username)
+
+
+def get_posts_count(author):
+    try:
+        return author.post_counter.posts_count
+    except AuthorCounter.DoesNotExist:
+        return 0
+
+
+# Поля, которые выводят ленты и от которых зависит ключ кеша фрагментов.
+POST_FEED_FIELDS = ('pub_date', 'edited', 'text_html', 'author', 'group')
+FEED_RELATED_FIELDS = {
+    'author': ('username', 'first_name', 'last_name'),
+    'group': ('slug', 'title'),
+}
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self, related=('author', 'group')):
+        """Посты для лент только с выводимыми полями.
+
+        Без полного текста, хеша пароля и флагов автора и описания группы.
+        related - связи, которые нужно подтянуть тем же запросом.
+        """
+        fields = list(POST_FEED_FIELDS)
+        for name in related:
+            fields += [
+                f'{name}__{field}' for field in FEED_RELATED_FIELDS[name]
+            ]
+        return self.select_related(*related).only(*fields)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.prepare_text()
+        with transaction.atomic():
+            objs = super().bulk_create(objs, *args, **kwargs)
+            posts_bulk_created.send(sender=self.model, posts=objs)
+        return objs
+
 
 class Post(models.Model):
     text = models.TextField(
@@ -15,6 +108,10 @@ class Post(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    edited = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -30,18 +127,84 @@ class Post(models.Model):
         related_name='posts',
         help_text='Группа, к которой будет относиться пост'
     )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст поста в HTML'
+    )
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.text[:LIMIT]
 
+    def get_absolute_url(self):
+        return cached_reverse('posts:post_detail', 'post_id', self.pk)
+
+    def prepare_text(self):
+        """HTML и начало текста считаются при записи, а не при показе."""
+        self.text_html = render_text(self.text)
+        self.excerpt = make_excerpt(self.text)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.prepare_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'text_html', 'excerpt'
+                }
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('pub_date',), name='post_pub_date_idx'),
+            models.Index(
+                fields=('group', 'pub_date'), name='post_group_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'), name='post_author_pub_date_idx'
+            ),
+        )
 
 
 class Group(models.Model):
     title = models.CharField(max_length=200, verbose_name='Загаловок')
     slug = models.SlugField(unique=True)
     description = models.TextField(verbose_name='Описание группы')
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество постов'
+    )
 
     def __str__(self):
         return self.title
+
+    def get_absolute_url(self):
+        return cached_reverse('posts:group_list', 'slug', self.slug)
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество постов'
+    )
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
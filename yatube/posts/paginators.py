@@ -0,0 +1,219 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Page, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Max, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+QUERY_COUNT_KEY = 'paginator:count:{}:{}'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(pub_date, pk, backwards=False):
+    raw = json.dumps([pub_date.isoformat(), pk, int(backwards)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        pub_date, pk, backwards = json.loads(raw.decode())
+        pub_date = parse_datetime(pub_date)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursor(token)
+    if pub_date is None or not isinstance(pk, int):
+        raise InvalidCursor(token)
+    return pub_date, pk, bool(backwards)
+
+
+def queryset_count_key(queryset, version=''):
+    """Ключ кеша числа объектов по тексту SQL и версии данных.
+
+    Без версии ключ живет до истечения TTL.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    raw = f'{queryset.db}:{sql}:{params!r}'
+    return QUERY_COUNT_KEY.format(
+        version, hashlib.md5(raw.encode()).hexdigest()
+    )
+
+
+def estimate_count(model, using='default'):
+    """Примерное число строк таблицы без полного COUNT.
+
+    Берется из статистики ANALYZE (sqlite_stat1), а без нее - по
+    наибольшему первичному ключу: удаленные строки завышают оценку.
+    """
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                    [model._meta.db_table]
+                )
+                row = cursor.fetchone()
+        except DatabaseError:
+            row = None
+        if row is not None:
+            return int(row[0].split()[0])
+    return model._default_manager.using(using).aggregate(
+        last=Max('pk')
+    )['last'] or 0
+
+
+class FeedPage(Page):
+    @property
+    def page_window(self):
+        """Номера страниц вокруг текущей плюс первая и последняя.
+
+        Пропуски между ними обозначены None.
+        """
+        side = settings.PAGINATOR_WINDOW
+        last = self.paginator.num_pages
+        numbers = {1, last}
+        numbers.update(range(
+            max(1, self.number - side), min(last, self.number + side) + 1
+        ))
+        window = []
+        previous = 0
+        for number in sorted(numbers):
+            if number - previous > 1:
+                window.append(None)
+            window.append(number)
+            previous = number
+        return window
+
+
+class FeedPaginator(Paginator):
+    """Paginator с известным заранее или закешированным числом объектов."""
+
+    def __init__(self, object_list, per_page, count=None, count_key=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        return cache.get_or_set(
+            self.count_key,
+            lambda: Paginator.count.func(self),
+            settings.PAGINATOR_COUNT_TIMEOUT
+        )
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page of %s items>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _position(row):
+    # Строки бывают моделями или словарями из values().
+    if isinstance(row, dict):
+        return row['pub_date'], row['id']
+    return row.pub_date, row.id
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (pub_date, id) без COUNT и OFFSET."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def get_page(self, cursor):
+        """Вернуть страницу по токену; битый токен ведет на первую."""
+        try:
+            position = decode_cursor(cursor) if cursor else None
+        except InvalidCursor:
+            position = None
+        if position is None:
+            return self._first_page()
+        pub_date, pk, backwards = position
+        if backwards:
+            page = self._page_before(pub_date, pk)
+        else:
+            page = self._page_after(pub_date, pk)
+        return page if len(page) else self._first_page()
+
+    def _fetch(self, queryset):
+        rows = list(queryset[:self.per_page + 1])
+        return rows[:self.per_page], len(rows) > self.per_page
+
+    def _first_page(self):
+        rows, has_next = self._fetch(
+            self.object_list.order_by('-pub_date', '-id')
+        )
+        return self._page(rows, has_next, has_previous=False)
+
+    def _page_after(self, pub_date, pk):
+        rows, has_next = self._fetch(
+            self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+            ).order_by('-pub_date', '-id')
+        )
+        return self._page(rows, has_next, has_previous=True)
+
+    def _page_before(self, pub_date, pk):
+        rows, has_previous = self._fetch(
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+            ).order_by('pub_date', 'id')
+        )
+        rows.reverse()
+        return self._page(rows, has_next=True, has_previous=has_previous)
+
+    def _page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(*_position(rows[-1]))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(
+                *_position(rows[0]), backwards=True
+            )
+        return CursorPage(rows, self, next_cursor, previous_cursor)
@@ -0,0 +1,83 @@
+import re
+
+from django.db import connections
+
+FTS_TABLE = 'posts_post_fts'
+TOKEN_RE = re.compile(r'\w+')
+
+# Триггеры, которые держат индекс FTS5 в согласии с posts_post. SQLite
+# удаляет их вместе с таблицей, когда миграция пересобирает posts_post.
+FTS_TRIGGERS = {
+    'posts_post_fts_insert': """
+        CREATE TRIGGER posts_post_fts_insert AFTER INSERT ON posts_post BEGIN
+            INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+        END
+    """,
+    'posts_post_fts_delete': """
+        CREATE TRIGGER posts_post_fts_delete AFTER DELETE ON posts_post BEGIN
+            INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        END
+    """,
+    'posts_post_fts_update': """
+        CREATE TRIGGER posts_post_fts_update AFTER UPDATE OF text
+        ON posts_post BEGIN
+            INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+            INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+        END
+    """,
+}
+
+
+def fts_query(text):
+    """Слова запроса в кавычках: операторы FTS5 из ввода не исполняются."""
+    return ' '.join(f'"{token}"' for token in TOKEN_RE.findall(text))
+
+
+def restore_fts_triggers(connection):
+    """Пересоздает потерянные триггеры FTS5 и перестраивает индекс.
+
+    Возвращает имена пересозданных триггеров.
+    """
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{FTS_TABLE}%'],
+        )
+        existing = {name for name, in cursor.fetchall()}
+        if FTS_TABLE not in existing:
+            return []
+        missing = [name for name in FTS_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(FTS_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+    return missing
+
+
+def search_posts(queryset, text):
+    """Посты, где есть все слова запроса, от самых релевантных."""
+    query = fts_query(text)
+    if not query:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        for token in TOKEN_RE.findall(text):
+            queryset = queryset.filter(text__icontains=token)
+        return queryset
+    # rank в FTS5 по умолчанию равен bm25(): чем меньше, тем точнее.
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = posts_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[query],
+        select={'rank': f'{FTS_TABLE}.rank'},
+        order_by=['rank', '-pub_date'],
+    )
@@ -0,0 +1,112 @@
+from collections import Counter
+
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from .cache import (
+    bump_feeds, forget_post_feeds, group_feed, index_feed, post_feed,
+    profile_feed
+)
+from .models import (
+    Group, Post, User, change_post_counters, posts_bulk_created
+)
+from .search import restore_fts_triggers
+
+
+def owner_feeds(author_ids, group_ids):
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        'username', flat=True
+    )
+    slugs = Group.objects.filter(pk__in=group_ids).values_list(
+        'slug', flat=True
+    )
+    return (
+        [index_feed()]
+        + [profile_feed(username) for username in usernames]
+        + [group_feed(slug) for slug in slugs]
+    )
+
+
+def group_feeds(group, *slugs):
+    usernames = User.objects.filter(posts__group=group).distinct(
+    ).values_list('username', flat=True)
+    return (
+        [index_feed()]
+        + [group_feed(slug) for slug in (group.slug, *slugs) if slug]
+        + [profile_feed(username) for username in usernames]
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_owners(sender, instance, **kwargs):
+    instance._previous_owners = None
+    if instance.pk is not None:
+        instance._previous_owners = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('author_id', 'group_id').first()
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, **kwargs):
+    authors = Counter({instance.author_id: 1})
+    groups = Counter({instance.group_id: 1})
+    if instance._previous_owners is not None:
+        author_id, group_id = instance._previous_owners
+        authors[author_id] -= 1
+        groups[group_id] -= 1
+    change_post_counters(authors, groups)
+    forget_post_feeds(instance.pk)
+    bump_feeds(post_feed(instance.pk), *owner_feeds(authors, groups))
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    # При удалении группы посты получают group=NULL через SET_NULL,
+    # а счетчик уходит вместе со строкой группы, поэтому отдельно
+    # этот случай не обрабатывается.
+    change_post_counters(
+        Counter({instance.author_id: -1}),
+        Counter({instance.group_id: -1}),
+    )
+    forget_post_feeds(instance.pk)
+    bump_feeds(
+        post_feed(instance.pk),
+        *owner_feeds([instance.author_id], [instance.group_id])
+    )
+
+
+@receiver(posts_bulk_created, sender=Post)
+def count_bulk_created_posts(sender, posts, **kwargs):
+    authors = Counter(post.author_id for post in posts)
+    groups = Counter(post.group_id for post in posts)
+    change_post_counters(authors, groups)
+    bump_feeds(*owner_feeds(authors, groups))
+
+
+@receiver(pre_save, sender=Group)
+def remember_previous_slug(sender, instance, **kwargs):
+    instance._previous_slug = None
+    if instance.pk is not None:
+        instance._previous_slug = Group.objects.filter(
+            pk=instance.pk
+        ).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Group)
+def drop_group_pages(sender, instance, **kwargs):
+    bump_feeds(*group_feeds(instance, instance._previous_slug))
+
+
+@receiver(pre_delete, sender=Group)
+def drop_deleted_group_pages(sender, instance, **kwargs):
+    bump_feeds(*group_feeds(instance))
+
+
+@receiver(post_migrate)
+def check_fts_triggers(sender, using, **kwargs):
+    # Миграции, пересобирающие posts_post в SQLite, теряют триггеры FTS5.
+    if sender.name == 'posts':
+        restore_fts_triggers(connections[using])
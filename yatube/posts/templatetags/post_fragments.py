@@ -0,0 +1,61 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+FRAGMENT_KEY = 'post:fragment:{}:{}:{}:{}'
+ARTICLE_TEMPLATE = 'includes/article.html'
+
+
+def post_version(post):
+    # Кроме даты правки во фрагмент попадают имя автора и группа,
+    # поэтому их переименование тоже должно менять ключ. HTML текста
+    # пересчитывает render_post_text, не меняя дату правки.
+    group = post.group
+    marker = '|'.join((
+        post.edited.isoformat(),
+        post.text_html,
+        post.author.username,
+        post.author.get_full_name(),
+        group.slug if group else '',
+        group.title if group else '',
+    ))
+    return hashlib.md5(marker.encode()).hexdigest()
+
+
+def fragment_key(post, template_name):
+    return FRAGMENT_KEY.format(
+        template_name, translation.get_language(), post.id, post_version(post)
+    )
+
+
+def render_fragments(posts, template_name):
+    keys = {fragment_key(post, template_name): post for post in posts}
+    fragments = cache.get_many(list(keys))
+    missing = {}
+    if len(fragments) < len(keys):
+        fragment_template = get_template(template_name)
+        for key, post in keys.items():
+            if key not in fragments:
+                missing[key] = fragment_template.render({'post': post})
+        cache.set_many(missing, settings.POST_FRAGMENT_TIMEOUT)
+    fragments.update(missing)
+    return [(post, mark_safe(fragments[key])) for key, post in keys.items()]
+
+
+@register.simple_tag
+def render_article(post, template_name=ARTICLE_TEMPLATE):
+    """Отрисованный пост из кеша фрагментов."""
+    return render_fragments([post], template_name)[0][1]
+
+
+@register.simple_tag
+def render_articles(posts, template_name=ARTICLE_TEMPLATE):
+    """Пары (пост, html) для всей страницы за одно обращение к кешу."""
+    return render_fragments(posts, template_name)
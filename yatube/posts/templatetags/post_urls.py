@@ -0,0 +1,11 @@
+from django import template
+
+from posts.models import profile_url as author_profile_url
+
+register = template.Library()
+
+
+@register.filter
+def profile_url(author):
+    """Адрес профиля автора без обхода резолвера."""
+    return author_profile_url(author)
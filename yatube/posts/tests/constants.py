@@ -5,6 +5,7 @@ PROFILE_URL_NAME = 'posts:profile'
 POST_DETAIL_URL_NAME = 'posts:post_detail'
 POST_EDIT_URL_NAME = 'posts:post_edit'
 POST_CREATE_URL_NAME = 'posts:post_create'
+SEARCH_URL_NAME = 'posts:search'
 
 # URLS ADDRESS
 INDEX_URL_TEMPLATE = 'posts/index.html'
@@ -13,3 +14,4 @@ PROFILE_URL_TEMPLATE = 'posts/profile.html'
 POST_DETAIL_URL_TEMPLATE = 'posts/post_detail.html'
 POST_EDIT_URL_TEMPLATE = 'posts/post_create.html'
 POST_CREATE_URL_TEMPLATE = 'posts/post_create.html'
+SEARCH_URL_TEMPLATE = 'posts/search.html'
@@ -0,0 +1,112 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.imports import bulk_create_dated
+from posts.models import Group, Post, User
+
+TEST_OF_POST = 12
+TEST_OF_GROUP = 5
+CHANGELIST_URL_NAME = 'admin:posts_post_changelist'
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser('admin', 'a@a.ru', 'pass')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Тестовая группа {i}',
+                slug=f'test-slug-{i}',
+                description='Тестовое описание',
+            )
+            for i in range(TEST_OF_GROUP)
+        ]
+        for i in range(TEST_OF_POST):
+            Post.objects.create(
+                text=f'Тестовый пост {i}',
+                author=cls.admin,
+                group=cls.groups[i % TEST_OF_GROUP],
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def get_changelist(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(CHANGELIST_URL_NAME), params)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries]
+
+    def test_group_choices_loaded_once(self):
+        """Список групп для всех строк загружается одним запросом."""
+        response, queries = self.get_changelist()
+        group_queries = [
+            sql for sql in queries if sql.startswith('SELECT "posts_group"')
+        ]
+        self.assertEqual(len(group_queries), 1)
+        self.assertContains(
+            response, 'Тестовая группа 0', count=TEST_OF_POST
+        )
+
+    def test_count_is_cached(self):
+        """Число постов для paginator берется из кеша."""
+        for params in ({}, {'pub_date__year': 2000}):
+            with self.subTest(params=params):
+                self.get_changelist(**params)
+                _, queries = self.get_changelist(**params)
+                self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_unfiltered_count_estimated(self):
+        """Без фильтров число постов оценивается без COUNT."""
+        Post.objects.filter(pk=Post.objects.order_by('pk')[0].pk).delete()
+        response, queries = self.get_changelist()
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        self.assertEqual(
+            response.context['cl'].paginator.count,
+            Post.objects.order_by('-pk')[0].pk,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        response, _ = self.get_changelist()
+        self.assertEqual(
+            response.context['cl'].paginator.count, TEST_OF_POST - 1
+        )
+
+    def test_filtered_count_dropped_on_delete(self):
+        """Удаление поста сбрасывает число в отфильтрованном списке."""
+        params = {'q': 'Тестовый'}
+        response, _ = self.get_changelist(**params)
+        self.assertEqual(response.context['cl'].paginator.count, TEST_OF_POST)
+        Post.objects.filter(pk=Post.objects.order_by('pk')[0].pk).delete()
+        response, _ = self.get_changelist(**params)
+        self.assertEqual(
+            response.context['cl'].paginator.count, TEST_OF_POST - 1
+        )
+
+    def test_date_hierarchy_single_distinct_query(self):
+        """Периоды date_hierarchy выбираются одним запросом DISTINCT."""
+        bulk_create_dated(
+            Post(
+                text='Старый пост', author=self.admin,
+                pub_date=timezone.make_aware(
+                    datetime.strptime(day, '%Y-%m-%d')
+                ),
+            )
+            for day in ('2019-12-31', '2021-02-14', '2021-02-15')
+        )
+        response, queries = self.get_changelist()
+        self.assertEqual(
+            len([sql for sql in queries if 'DISTINCT' in sql]), 1
+        )
+        for year in ('2019', '2021'):
+            self.assertContains(response, f'pub_date__year={year}')
+        self.assertNotContains(response, 'pub_date__year=2020')
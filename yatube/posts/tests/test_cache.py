@@ -0,0 +1,276 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+)
+from django.urls import reverse
+
+from core.checks import check_shared_cache
+from core.donut import fill_holes, hole_marker
+from posts.cache import (
+    LOCK_KEY, cache_feed_page, get_cache_stats, page_cache_key,
+    reset_cache_stats
+)
+from posts.models import Group, Post, User
+from .constants import (
+    INDEX_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    PROFILE_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    POST_EDIT_URL_NAME,
+    POST_CREATE_URL_NAME,
+)
+
+
+class FeedPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+        cls.index_url = reverse(INDEX_URL_NAME)
+        cls.group_url = reverse(
+            GROUP_LIST_URL_NAME, kwargs={'slug': cls.group.slug}
+        )
+        cls.profile_url = reverse(
+            PROFILE_URL_NAME, kwargs={'username': cls.user.username}
+        )
+        cls.feed_urls = (cls.index_url, cls.group_url, cls.profile_url)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_anonymous_pages_served_from_cache(self):
+        """Повторный запрос анонима отдается из кеша без запросов к БД."""
+        reset_cache_stats()
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(second['X-Feed-Cache'], 'hit')
+                self.assertEqual(first.content, second.content)
+        self.assertEqual(
+            get_cache_stats(),
+            {'hit': 3, 'miss': 3, 'refresh': 0, 'stale': 0, 'wait': 0}
+        )
+
+    def test_authorized_pages_share_cached_shell(self):
+        """Авторизованные и анонимы получают одну страницу из кеша,
+        а шапка с пользователем отрисовывается для каждого."""
+        other = User.objects.create_user(username='other')
+        other_client = Client()
+        other_client.force_login(other)
+        self.assertEqual(
+            self.authorized_client.get(self.index_url)['X-Feed-Cache'],
+            'miss'
+        )
+        clients = (
+            (other_client, 'Пользователь: other'),
+            (self.client, 'Войти'),
+            (self.authorized_client, 'Пользователь: kir'),
+        )
+        for client, header in clients:
+            with self.subTest(header=header):
+                response = client.get(self.index_url)
+                self.assertEqual(response['X-Feed-Cache'], 'hit')
+                self.assertContains(response, header)
+                self.assertNotContains(response, '<!--donut:')
+        self.assertNotContains(self.client.get(self.index_url), 'Выйти')
+
+    def test_donut_rendered_inline_without_page_cache(self):
+        """На страницах без кеша фрагмент шапки выводится на месте."""
+        response = self.authorized_client.get(
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id})
+        )
+        self.assertContains(response, 'Пользователь: kir')
+        self.assertNotContains(response, '<!--donut:')
+
+    def test_new_post_drops_affected_feeds(self):
+        """Новый пост сбрасывает ленты, в которые он попадает."""
+        other_group = Group.objects.create(
+            title='Другая группа', slug='other-slug', description='Описание'
+        )
+        other_url = reverse(
+            GROUP_LIST_URL_NAME, kwargs={'slug': other_group.slug}
+        )
+        for url in self.feed_urls + (other_url,):
+            self.client.get(url)
+        self.authorized_client.post(
+            reverse(POST_CREATE_URL_NAME),
+            data={'text': 'Свежий пост', 'group': self.group.id},
+        )
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Свежий пост')
+        self.assertEqual(self.client.get(other_url)['X-Feed-Cache'], 'hit')
+
+    def test_edit_moves_post_between_group_pages(self):
+        """Перенос поста в другую группу обновляет обе страницы групп."""
+        other_group = Group.objects.create(
+            title='Другая группа', slug='other-slug', description='Описание'
+        )
+        other_url = reverse(
+            GROUP_LIST_URL_NAME, kwargs={'slug': other_group.slug}
+        )
+        self.client.get(self.group_url)
+        self.client.get(other_url)
+        self.authorized_client.post(
+            reverse(POST_EDIT_URL_NAME, kwargs={'post_id': self.post.id}),
+            data={'text': 'Перенесенный пост', 'group': other_group.id},
+        )
+        self.assertNotContains(self.client.get(self.group_url),
+                               'Перенесенный пост')
+        self.assertContains(self.client.get(other_url), 'Перенесенный пост')
+
+    def test_group_change_drops_group_pages(self):
+        """Изменение группы сбрасывает страницы, где она показана."""
+        for url in self.feed_urls:
+            self.client.get(url)
+        self.group.title = 'Новое название'
+        self.group.save()
+        for url in self.feed_urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Новое название')
+
+    def test_post_detail_cached_with_edit_link_hole(self):
+        """Страница поста берется из кеша, ссылка на правку - только
+        у автора."""
+        url = reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id})
+        other = User.objects.create_user(username='other')
+        other_client = Client()
+        other_client.force_login(other)
+        self.assertContains(
+            self.authorized_client.get(url), 'редактировать запись'
+        )
+        for client in (other_client, self.client):
+            response = client.get(url)
+            self.assertEqual(response['X-Feed-Cache'], 'hit')
+            self.assertNotContains(response, 'редактировать запись')
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Исправленный пост'
+        post.save()
+        self.assertContains(self.client.get(url), 'Исправленный пост')
+
+    def test_forged_marker_not_filled(self):
+        """Метка в тексте поста не отрисовывается ни в HTML, ни в JSON."""
+        forged = '<!--donut:' + '0' * 40 + ':includes/user_menu.html-->'
+        Post.objects.create(text=f'hi {forged}', author=self.user)
+        for _ in range(2):
+            response = self.client.get(reverse('api:post_list'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()['results'][0]['text'], f'hi {forged}'
+            )
+        self.assertNotContains(self.client.get(self.index_url), forged)
+
+    def test_fill_holes_checks_signature_and_registry(self):
+        """Заполняются только подписанные метки шаблонов из
+        DONUT_TEMPLATES."""
+        request = RequestFactory().get('/')
+        request.user = self.user
+        request.resolver_match = None
+        good = hole_marker('includes/user_menu.html', {})
+        tampered = hole_marker(
+            'includes/post_edit_link.html', {'author': 'other'}
+        ).replace('other', 'kir')
+        unknown = hole_marker('includes/article.html', {})
+        content = fill_holes(good + tampered + unknown, request)
+        self.assertIn('Пользователь: kir', content)
+        self.assertIn(tampered, content)
+        self.assertIn(unknown, content)
+
+
+STAMPEDE_URL = '/stampede/'
+
+
+def stampede_feed():
+    return 'stampede'
+
+
+class StampedeProtectionTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.view = cache_feed_page(stampede_feed)(self.render_page)
+        self.key = page_cache_key(
+            RequestFactory().get(STAMPEDE_URL), 'render_page', ['stampede']
+        )
+        self.lock_key = LOCK_KEY.format(self.key)
+
+    def render_page(self, request):
+        self.calls += 1
+        return HttpResponse(f'версия {self.calls}')
+
+    def get(self):
+        request = RequestFactory().get(STAMPEDE_URL)
+        request.user = AnonymousUser()
+        return self.view(request)
+
+    @override_settings(FEED_CACHE_TIMEOUT=0)
+    def test_stale_copy_served_while_locked(self):
+        """Пока страницу пересчитывает другой запрос, отдается старая."""
+        self.get()
+        cache.add(self.lock_key, 1)
+        response = self.get()
+        self.assertEqual(response['X-Feed-Cache'], 'stale')
+        self.assertEqual(response.content.decode(), 'версия 1')
+        cache.delete(self.lock_key)
+        self.assertEqual(self.get().content.decode(), 'версия 2')
+        self.assertEqual(get_cache_stats()['stale'], 1)
+        self.assertEqual(get_cache_stats()['refresh'], 1)
+
+    def test_waits_for_lock_holder(self):
+        """Без копии в кеше запрос ждет страницу от держателя блокировки."""
+        cache.add(self.lock_key, 1)
+        threading.Timer(0.1, cache.set, (
+            self.key, ('готово', 'text/html', time.time() + 60, 0)
+        )).start()
+        response = self.get()
+        self.assertEqual(response['X-Feed-Cache'], 'wait')
+        self.assertEqual(response.content.decode(), 'готово')
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(get_cache_stats()['wait'], 1)
+
+    @override_settings(FEED_LOCK_WAIT=0.1)
+    def test_stops_waiting_after_timeout(self):
+        """Не дождавшись держателя блокировки, запрос считает сам."""
+        cache.add(self.lock_key, 1)
+        self.assertEqual(self.get().content.decode(), 'версия 1')
+        self.assertEqual(get_cache_stats()['wait'], 1)
+        self.assertEqual(get_cache_stats()['miss'], 1)
+
+    def test_early_expiry(self):
+        """Долгая в расчете страница обновляется до конца срока."""
+        cache.set(self.key, ('старая', 'text/html', time.time() + 5, 1))
+        with mock.patch('posts.cache.random.random', return_value=0.9999):
+            with override_settings(FEED_EARLY_EXPIRY_BETA=0):
+                self.assertEqual(self.get().content.decode(), 'старая')
+            self.assertEqual(self.get().content.decode(), 'версия 1')
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def test_process_local_cache_warned(self):
+        """check --deploy предупреждает о кеше в памяти процесса."""
+        self.assertEqual(
+            [error.id for error in check_shared_cache(None)], ['core.W001']
+        )
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': '127.0.0.1:11211',
+        }}):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import MODIFIED_KEY, feed_validators, group_feed
+from posts.models import Group, Post, User
+from .constants import (
+    INDEX_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    PROFILE_URL_NAME,
+    POST_DETAIL_URL_NAME,
+)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.other = User.objects.create_user(username='max')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+        cls.urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, kwargs={'slug': cls.group.slug}),
+            reverse(PROFILE_URL_NAME, kwargs={'username': cls.user}),
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': cls.post.id}),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def revalidate(self, client, url, response):
+        return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_not_modified(self):
+        """Неизмененная страница отдается как 304 без запросов к БД."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('Cookie', response['Vary'])
+                self.assertTrue(response.has_header('Last-Modified'))
+                with self.assertNumQueries(0):
+                    second = self.revalidate(self.client, url, response)
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b'')
+
+    def test_etag_varies_by_user(self):
+        """У разных пользователей разные ETag одной страницы."""
+        other_client = Client()
+        other_client.force_login(self.other)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertEqual(
+                    self.revalidate(other_client, url, response).status_code,
+                    200,
+                )
+                self.assertEqual(
+                    self.revalidate(self.client, url, response).status_code,
+                    200,
+                )
+
+    def test_login_ignores_if_modified_since(self):
+        """После входа If-Modified-Since анонимной страницы не дает 304."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                second = self.authorized_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+                )
+                self.assertEqual(second.status_code, 200)
+                self.assertFalse(second.has_header('Last-Modified'))
+
+    def test_changes_invalidate_validators(self):
+        """Правка поста и группы меняет валидаторы зависимых страниц."""
+        responses = {url: self.client.get(url) for url in self.urls}
+        post = Post.objects.get(id=self.post.id)
+        post.text = 'Исправленный пост'
+        post.save()
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                self.assertContains(
+                    self.revalidate(self.client, url, response),
+                    'Исправленный пост',
+                )
+        detail_url = self.urls[-1]
+        response = self.client.get(detail_url)
+        Group.objects.filter(id=self.group.id).get().save()
+        self.assertEqual(
+            self.revalidate(self.client, detail_url, response).status_code,
+            200,
+        )
+
+    def test_unknown_feed_gets_no_validators(self):
+        """Выдуманная группа дает 404 при любых заголовках и не оставляет
+        в кеше бессрочных ключей."""
+        url = reverse(GROUP_LIST_URL_NAME, kwargs={'slug': 'no-such-group'})
+        for headers in (
+            {},
+            {'HTTP_IF_NONE_MATCH': '*'},
+            {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'},
+        ):
+            with self.subTest(headers=headers):
+                response = self.client.get(url, **headers)
+                self.assertEqual(response.status_code, 404)
+                self.assertFalse(response.has_header('ETag'))
+        feed = group_feed('no-such-group')
+        self.assertIsNone(cache.get(MODIFIED_KEY.format(feed)))
+        self.assertIsNone(feed_validators([feed]))
+
+    def test_missing_post_returns_404(self):
+        """Для несуществующего поста валидаторов нет, ответ 404."""
+        response = self.client.get(
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': 10 ** 6})
+        )
+        self.assertEqual(response.status_code, 404)
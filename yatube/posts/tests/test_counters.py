@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import AuthorCounter, Group, Post, User, get_posts_count
+from .constants import (
+    PROFILE_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    POST_EDIT_URL_NAME,
+    POST_CREATE_URL_NAME,
+)
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assertCounters(self, author, group, other_group):
+        self.user.refresh_from_db()
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(get_posts_count(self.user), author)
+        self.assertEqual(self.group.posts_count, group)
+        self.assertEqual(self.other_group.posts_count, other_group)
+
+    def test_counters_follow_create_edit_delete(self):
+        """Счетчики меняются при создании, переносе и удалении поста."""
+        self.authorized_client.post(
+            reverse(POST_CREATE_URL_NAME),
+            data={'text': 'Тестовый текст', 'group': self.group.id},
+        )
+        self.assertCounters(1, 1, 0)
+        post = Post.objects.get()
+        self.authorized_client.post(
+            reverse(POST_EDIT_URL_NAME, kwargs={'post_id': post.id}),
+            data={'text': 'Новый текст', 'group': self.other_group.id},
+        )
+        self.assertCounters(1, 0, 1)
+        post.refresh_from_db()
+        post.delete()
+        self.assertCounters(0, 0, 0)
+
+    def test_counters_follow_bulk_create_and_group_delete(self):
+        """bulk_create учитывается, удаление группы не ломает счетчики."""
+        Post.objects.bulk_create(
+            Post(text=f'Текст {i}', author=self.user, group=self.group)
+            for i in range(3)
+        )
+        self.assertCounters(3, 3, 0)
+        group = Group.objects.create(
+            title='Удаляемая группа',
+            slug='doomed-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(text='Текст', author=self.user, group=group)
+        group.delete()
+        self.assertCounters(4, 3, 0)
+        self.assertEqual(Post.objects.filter(group=None).count(), 1)
+
+    def test_rebuild_command(self):
+        """Команда rebuild_post_counters пересчитывает счетчики с нуля."""
+        Post.objects.create(text='Текст', author=self.user, group=self.group)
+        AuthorCounter.objects.all().delete()
+        Group.objects.update(posts_count=42)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertCounters(1, 1, 0)
+
+    def test_pages_read_counters(self):
+        """Профиль и пост показывают счетчик без COUNT по постам."""
+        post = Post.objects.create(text='Текст', author=self.user)
+        urls = (
+            reverse(PROFILE_URL_NAME, kwargs={'username': self.user}),
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': post.id}),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorized_client.get(url)
+                self.assertEqual(response.context['posts_count'], 1)
+                self.assertFalse(any(
+                    'COUNT' in query['sql'] and 'posts_post' in query['sql']
+                    for query in queries.captured_queries
+                ))
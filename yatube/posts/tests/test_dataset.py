@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import AuthorCounter, Group, Post
+
+
+class GenerateDatasetTest(TestCase):
+    def generate(self, prefix):
+        call_command(
+            'generate_dataset', users=5, groups=3, posts=50, batch_size=20,
+            seed=7, prefix=prefix, stdout=StringIO()
+        )
+        return list(Post.objects.filter(
+            author__username__startswith=f'{prefix}_'
+        ).order_by('id').values_list(
+            'text', 'author__username', 'group__slug'
+        ))
+
+    def test_dataset_is_reproducible(self):
+        """Одинаковый seed дает одинаковые посты и верные счетчики."""
+        first = self.generate('first')
+        second = self.generate('second')
+        self.assertEqual(len(first), 50)
+        self.assertEqual(
+            [(text, author[6:], slug and slug[7:]) for text, author, slug
+             in first],
+            [(text, author[7:], slug and slug[8:]) for text, author, slug
+             in second]
+        )
+        self.assertEqual(
+            sum(AuthorCounter.objects.values_list('posts_count', flat=True)),
+            100
+        )
+        self.assertEqual(
+            sum(Group.objects.values_list('posts_count', flat=True)),
+            Post.objects.exclude(group=None).count()
+        )
+
+    def test_benchmark_views_report(self):
+        """benchmark_views пишет отчет по всем адресам posts и users."""
+        self.generate('bench')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            call_command(
+                'benchmark_views', repeat=2, output=path, stdout=StringIO()
+            )
+            with open(path, encoding='utf-8') as report_file:
+                report = json.load(report_file)
+        results = report['results']
+        self.assertIn('posts:index?page=1', results)
+        self.assertIn('users:login', results)
+        self.assertTrue(all(
+            result['status'] == 200 for result in results.values()
+        ))
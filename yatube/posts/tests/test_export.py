@@ -0,0 +1,103 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.exports import iter_posts
+from posts.models import Group, Post, User
+
+TEST_OF_POST = 7
+CHUNK_SIZE = 3
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.other = User.objects.create_user(username='max')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(TEST_OF_POST):
+            Post.objects.create(
+                text=f'Тестовый пост {i}',
+                author=cls.user,
+                group=cls.group if i % 2 else None,
+            )
+        Post.objects.create(text='Чужой пост', author=cls.other)
+
+    def export(self, *args, **options):
+        output = StringIO()
+        call_command(
+            'export_posts', *args, chunk_size=CHUNK_SIZE, stdout=output,
+            **options
+        )
+        return output.getvalue().splitlines()
+
+    def test_iter_posts_reads_by_keyset_chunks(self):
+        """Посты читаются порциями по id, каждая порция — один запрос."""
+        with CaptureQueriesContext(connection) as queries:
+            ids = [post['id'] for post in iter_posts(
+                Post.objects.all(), chunk_size=CHUNK_SIZE
+            )]
+        self.assertEqual(
+            ids, sorted(Post.objects.values_list('id', flat=True))
+        )
+        self.assertEqual(len(queries), 3)
+        self.assertIn('"posts_post"."id" >', queries[1]['sql'])
+
+    def test_export_jsonl_with_filters(self):
+        """Выгрузка в JSONL учитывает фильтры по автору и группе."""
+        rows = [json.loads(line) for line in self.export(author='kir')]
+        self.assertEqual(len(rows), TEST_OF_POST)
+        self.assertEqual(
+            set(rows[0]), {'id', 'text', 'pub_date', 'author', 'group'}
+        )
+        rows = self.export(group='test-slug')
+        self.assertEqual(len(rows), TEST_OF_POST // 2)
+        self.assertEqual(
+            self.export('--since=2000-01-01', '--until=2000-01-02'), []
+        )
+
+    def test_export_csv_can_be_imported(self):
+        """Выгрузка в CSV читается командой import_posts."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'posts.csv')
+        call_command(
+            'export_posts', format='csv', output=path, author='kir',
+            stdout=StringIO()
+        )
+        with open(path, encoding='utf-8', newline='') as source:
+            self.assertEqual(len(list(csv.DictReader(source))), TEST_OF_POST)
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(
+            Post.objects.filter(author=self.user).count(), TEST_OF_POST * 2
+        )
+
+    def test_admin_action_streams_selected_posts(self):
+        """Действие админки отдает выбранные посты потоковым ответом."""
+        admin = User.objects.create_superuser('admin', 'a@a.ru', 'pass')
+        self.client.force_login(admin)
+        selected = Post.objects.filter(author=self.user)[:2]
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            data={
+                'action': 'export_jsonl',
+                '_selected_action': [post.id for post in selected],
+            },
+        )
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('attachment', response['Content-Disposition'])
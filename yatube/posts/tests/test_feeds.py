@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class PostFeedsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+        cls.feeds = {}
+        for kind in ('rss', 'atom'):
+            cls.feeds[reverse(f'posts:index_{kind}')] = kind
+            cls.feeds[reverse(
+                f'posts:group_{kind}', kwargs={'slug': cls.group.slug}
+            )] = kind
+            cls.feeds[reverse(
+                f'posts:profile_{kind}', kwargs={'username': cls.user}
+            )] = kind
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_list_posts(self):
+        """Ленты RSS и Atom содержат посты."""
+        for url, kind in self.feeds.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(kind, response['Content-Type'])
+                self.assertContains(response, 'Тестовый пост')
+                self.assertContains(
+                    response,
+                    reverse('posts:post_detail', args=(self.post.id,)),
+                )
+
+    def test_polling_costs_no_queries(self):
+        """Повторный опрос ленты обходится без запросов к БД."""
+        for url in self.feeds:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    cached = self.client.get(url)
+                    not_modified = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=first['ETag']
+                    )
+                self.assertEqual(cached['X-Feed-Cache'], 'hit')
+                self.assertEqual(cached.content, first.content)
+                self.assertEqual(not_modified.status_code, 304)
+
+    def test_last_modified_same_for_miss_and_hit(self):
+        """Last-Modified промаха и попадания в кеш - время сброса ленты."""
+        old = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        Post.objects.filter(id=self.post.id).update(pub_date=old, edited=old)
+        for url in self.feeds:
+            with self.subTest(url=url):
+                miss = self.client.get(url)
+                hit = self.client.get(url)
+                self.assertEqual(hit['X-Feed-Cache'], 'hit')
+                self.assertNotIn('2000', miss['Last-Modified'])
+                self.assertEqual(miss['Last-Modified'], hit['Last-Modified'])
+
+    def test_new_post_updates_feeds(self):
+        """Новый пост попадает в ленты."""
+        for url in self.feeds:
+            self.client.get(url)
+        Post.objects.create(
+            text='Свежий пост', author=self.user, group=self.group
+        )
+        for url in self.feeds:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Свежий пост')
+
+    def test_unknown_group_returns_404(self):
+        """Лента несуществующей группы отдает 404."""
+        response = self.client.get(
+            reverse('posts:group_rss', kwargs={'slug': 'unknown'})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase
+
+from posts.models import Group, Post, User
+from posts.templatetags.post_fragments import fragment_key
+
+ARTICLE_TEMPLATE = 'includes/article.html'
+
+
+class PostFragmentCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый текст {i}', author=cls.user, group=cls.group)
+            for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def render(self, posts):
+        return Template(
+            '{% load post_fragments %}'
+            '{% render_articles posts as articles %}'
+            '{% for post, article in articles %}{{ article }}{% endfor %}'
+        ).render(Context({'posts': posts}))
+
+    def posts(self):
+        return list(Post.objects.select_related('author', 'group'))
+
+    def test_page_fragments_fetched_in_one_round_trip(self):
+        """Все фрагменты страницы берутся из кеша одним get_many."""
+        html = self.render(self.posts())
+        posts = self.posts()
+        keys = [fragment_key(post, ARTICLE_TEMPLATE) for post in posts]
+        self.assertEqual(len(cache.get_many(keys)), len(posts))
+        self.assertEqual(self.render(posts), html)
+
+    def test_edited_post_rendered_again(self):
+        """После правки перерисовывается только измененный пост."""
+        self.render(self.posts())
+        post = Post.objects.first()
+        post.text = 'Исправленный текст'
+        post.save()
+        posts = self.posts()
+        cached = cache.get_many(
+            [fragment_key(post, ARTICLE_TEMPLATE) for post in posts]
+        )
+        self.assertEqual(len(cached), len(posts) - 1)
+        self.assertIn('Исправленный текст', self.render(posts))
+
+    def test_single_article_tag(self):
+        """Тег render_article отдает тот же html, что и пакетный."""
+        post = self.posts()[0]
+        single = Template(
+            '{% load post_fragments %}{% render_article post %}'
+        ).render(Context({'post': post}))
+        self.assertEqual(single, self.render([post]))
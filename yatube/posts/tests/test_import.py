@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from posts.imports import bulk_create_dated
+from posts.models import Group, Post, User, get_posts_count
+
+TEST_OF_POST = 25
+
+
+class ImportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.rows = [
+            {
+                'text': f'Архивный пост {i}',
+                'author': 'kir',
+                'group': 'test-slug' if i % 2 else '',
+                'pub_date': f'2020-01-{i + 1:02d}T10:00:00',
+            }
+            for i in range(TEST_OF_POST)
+        ]
+        self.rows.append({'text': 'Чужой', 'author': 'nobody', 'group': ''})
+
+    def write_jsonl(self):
+        path = os.path.join(self.directory, 'posts.jsonl')
+        with open(path, 'w', encoding='utf-8') as source:
+            for row in self.rows:
+                source.write(json.dumps(row, ensure_ascii=False) + '\n')
+        return path
+
+    def import_posts(self, path, **options):
+        call_command(
+            'import_posts', path, batch_size=4, batches_per_transaction=2,
+            stdout=StringIO(), **options
+        )
+
+    def test_import_jsonl(self):
+        """Посты из JSONL импортируются с датой, группой и счетчиками."""
+        self.import_posts(self.write_jsonl())
+        self.assertEqual(Post.objects.count(), TEST_OF_POST)
+        self.assertEqual(
+            Post.objects.filter(group=self.group).count(), TEST_OF_POST // 2
+        )
+        self.assertEqual(
+            Post.objects.order_by('pub_date').first().pub_date.day, 1
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(get_posts_count(self.user), TEST_OF_POST)
+
+    def test_import_csv(self):
+        """Посты из CSV импортируются так же, как из JSONL."""
+        path = os.path.join(self.directory, 'posts.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as source:
+            writer = csv.DictWriter(
+                source, fieldnames=('text', 'author', 'group', 'pub_date')
+            )
+            writer.writeheader()
+            writer.writerows(self.rows)
+        self.import_posts(path)
+        self.assertEqual(Post.objects.count(), TEST_OF_POST)
+
+    def test_malformed_rows_skipped(self):
+        """Битые строки пропускаются и не прерывают импорт."""
+        path = self.write_jsonl()
+        with open(path, 'a', encoding='utf-8') as source:
+            source.write('{"text": "Обрыв\n')
+            source.write('[1, 2]\n')
+            source.write('{"author": "kir"}\n')
+            source.write('{"text": "Дата", "author": "kir", '
+                         '"pub_date": "2020-13-45T10:00:00"}\n')
+            source.write('{"text": ["Список"], "author": "kir"}\n')
+        stdout = StringIO()
+        call_command('import_posts', path, stdout=stdout)
+        self.assertEqual(Post.objects.count(), TEST_OF_POST)
+        self.assertIn('пропущено 6', stdout.getvalue())
+
+    def test_resume_from_checkpoint(self):
+        """После сбоя импорт продолжается с контрольной точки."""
+        path = self.write_jsonl()
+        with open(f'{path}.checkpoint', 'w', encoding='utf-8') as checkpoint:
+            json.dump({'rows': 8}, checkpoint)
+        self.import_posts(path, resume=True)
+        self.assertEqual(Post.objects.count(), TEST_OF_POST - 8)
+        self.assertFalse(Post.objects.filter(text='Архивный пост 7').exists())
+        with open(f'{path}.checkpoint', encoding='utf-8') as checkpoint:
+            self.assertEqual(json.load(checkpoint)['rows'], len(self.rows))
+
+    def test_bulk_create_dated_keeps_dates(self):
+        """bulk_create_dated пишет заданную дату при вставке, без UPDATE,
+        и не меняет поле модели."""
+        pub_date = timezone.make_aware(datetime(2020, 5, 17, 12))
+        with CaptureQueriesContext(connection) as queries:
+            bulk_create_dated(
+                Post(text=f'Пост {i}', author=self.user, pub_date=pub_date)
+                for i in range(3)
+            )
+        self.assertEqual(Post.objects.filter(pub_date=pub_date).count(), 3)
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].startswith('UPDATE "posts_post"')
+        ])
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        post = Post.objects.create(text='Сейчас', author=self.user)
+        self.assertNotEqual(post.pub_date, pub_date)
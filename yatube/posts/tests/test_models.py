@@ -54,3 +54,20 @@ class PostAndGroupModelTest(TestCase):
                 self.assertEqual(
                     self.post._meta.get_field(field).help_text, expected_value
                 )
+
+    def test_feed_loads_only_shown_fields(self):
+        """Лента не загружает текст поста, пароль автора и описание
+        группы, а шаблону хватает загруженных полей."""
+        Post.objects.create(author=self.user, group=self.group, text='Пост')
+        with self.assertNumQueries(1):
+            posts = list(Post.objects.feed())
+            for post in posts:
+                post.author.get_full_name()
+                str(post.author)
+                post.text_html
+                post.edited
+                post.group and post.group.title
+        post = posts[0]
+        self.assertIn('text', post.get_deferred_fields())
+        self.assertIn('password', post.author.get_deferred_fields())
+        self.assertIn('description', post.group.get_deferred_fields())
@@ -0,0 +1,124 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator, FeedPaginator
+from .constants import (
+    INDEX_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    PROFILE_URL_NAME,
+)
+
+TEST_OF_POST = 13
+POST_LIMIT = 10
+MIN_POST_LIMIT = 3
+
+
+@override_settings(
+    CURSOR_PAGINATION_VIEWS=('index', 'group_list', 'profile')
+)
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_group',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый текст {i}', group=cls.group, author=cls.user)
+            for i in range(TEST_OF_POST)
+        )
+        cls.urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, kwargs={'slug': cls.group.slug}),
+            reverse(PROFILE_URL_NAME, kwargs={'username': cls.user.username}),
+        )
+
+    def test_next_and_previous_cursor(self):
+        """По курсору ленты листаются на 10 и 3 поста и обратно."""
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url).context['page_obj']
+                self.assertEqual(len(first), POST_LIMIT)
+                self.assertFalse(first.has_previous())
+                second = self.client.get(
+                    url, {'cursor': first.next_cursor}
+                ).context['page_obj']
+                self.assertEqual(len(second), MIN_POST_LIMIT)
+                self.assertFalse(second.has_next())
+                self.assertEqual(
+                    [post.id for post in first] + [post.id for post in second],
+                    expected
+                )
+                back = self.client.get(
+                    url, {'cursor': second.previous_cursor}
+                ).context['page_obj']
+                self.assertEqual(
+                    [post.id for post in back], [post.id for post in first]
+                )
+                self.assertFalse(back.has_previous())
+
+    def test_broken_cursor_returns_first_page(self):
+        """Битый курсор открывает первую страницу."""
+        for cursor in ('broken', 'WzEsIDJd', '!!'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.urls[0], {'cursor': cursor})
+                self.assertEqual(len(response.context['page_obj']), POST_LIMIT)
+
+    def test_cursor_page_skips_count(self):
+        """Курсорная страница выбирается одним запросом без COUNT."""
+        paginator = CursorPaginator(Post.objects.all(), POST_LIMIT)
+        page = paginator.get_page(None)
+        with self.assertNumQueries(1):
+            paginator.get_page(page.next_cursor)
+
+
+@override_settings(PAGINATOR_WINDOW=2)
+class FeedPaginatorTest(TestCase):
+    def test_page_window(self):
+        """Выводится окно вокруг текущей страницы, первая и последняя."""
+        paginator = FeedPaginator(range(1000), POST_LIMIT)
+        windows = {
+            1: [1, 2, 3, None, 100],
+            4: [1, 2, 3, 4, 5, 6, None, 100],
+            50: [1, None, 48, 49, 50, 51, 52, None, 100],
+            100: [1, None, 98, 99, 100],
+        }
+        for number, window in windows.items():
+            with self.subTest(number=number):
+                self.assertEqual(paginator.page(number).page_window, window)
+
+    def test_count_cached_by_key(self):
+        """Число объектов берется из кеша по переданному ключу."""
+        cache.clear()
+        user = User.objects.create_user(username='kir')
+        Post.objects.create(text='Тестовый текст', author=user)
+        FeedPaginator(Post.objects.all(), POST_LIMIT, count_key='key').count
+        with CaptureQueriesContext(connection) as queries:
+            count = FeedPaginator(
+                Post.objects.all(), POST_LIMIT, count_key='key'
+            ).count
+        self.assertEqual(count, 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_index_page_renders_bounded_links(self):
+        """На главной выводится ограниченное число ссылок на страницы."""
+        cache.clear()
+        user = User.objects.create_user(username='kir')
+        Post.objects.bulk_create(
+            Post(text='Тестовый текст', author=user)
+            for _ in range(POST_LIMIT * 30)
+        )
+        response = self.client.get(reverse(INDEX_URL_NAME), {'page': 15})
+        self.assertEqual(response.content.decode().count('page-item'), 13)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.profiling import hot_functions, read_stacks, write_stacks
+from posts.models import Post, User
+from .constants import INDEX_URL_NAME
+
+
+class SamplingProfilerTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        Post.objects.create(text='Тестовый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_sampled_request_writes_stacks(self):
+        """Выбранный запрос сохраняет стеки в каталог своего адреса."""
+        with override_settings(
+            PROFILER_SAMPLE_RATE=1, PROFILER_DIR=self.directory.name
+        ):
+            self.client.get(reverse(INDEX_URL_NAME))
+        files = os.listdir(os.path.join(self.directory.name, 'posts-index'))
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith('.folded'))
+
+    def test_header_profiles_request_in_debug(self):
+        """Заголовок X-Profile включает профилирование при DEBUG."""
+        with override_settings(
+            DEBUG=True, PROFILER_DIR=self.directory.name
+        ):
+            self.client.get(reverse(INDEX_URL_NAME), HTTP_X_PROFILE='1')
+        self.assertTrue(os.listdir(self.directory.name))
+
+    def test_report_aggregates_hot_functions(self):
+        """profile_report складывает сэмплы всех файлов адреса."""
+        stacks = {'main;view;render': 3, 'main;view;query': 1}
+        write_stacks(self.directory.name, 'posts:index', stacks)
+        write_stacks(self.directory.name, 'posts:index', stacks)
+        write_stacks(self.directory.name, 'posts:profile', {'main;x': 5})
+        merged = read_stacks(self.directory.name, 'posts:index')
+        self.assertEqual(merged['main;view;render'], 6)
+        own, total = hot_functions(merged)
+        self.assertEqual(own['render'], 6)
+        self.assertEqual(total['view'], 8)
+        out = StringIO()
+        call_command(
+            'profile_report', dir=self.directory.name, view='posts:index',
+            stdout=out
+        )
+        self.assertIn('Сэмплов: 8', out.getvalue())
+        self.assertIn('75.0%', out.getvalue())
@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.query_budget import (
+    QueryBudgetExceeded, QueryRecorder, query_budget
+)
+from posts import views
+from posts.models import Group, Post, User
+from .constants import (
+    INDEX_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    PROFILE_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    POST_EDIT_URL_NAME,
+    POST_CREATE_URL_NAME,
+)
+
+TEST_OF_POST = 12
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Тестовая группа {i}',
+                slug=f'test-slug-{i}',
+                description='Тестовое описание',
+            )
+            for i in range(3)
+        ]
+        for i in range(TEST_OF_POST):
+            cls.post = Post.objects.create(
+                text=f'Тестовый пост {i}',
+                author=cls.user,
+                group=cls.groups[i % len(cls.groups)],
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_views_fit_query_budget(self):
+        """Страницы укладываются в бюджет SQL-запросов."""
+        urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(
+                GROUP_LIST_URL_NAME, kwargs={'slug': self.groups[0].slug}
+            ),
+            reverse(PROFILE_URL_NAME, kwargs={'username': self.user}),
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id}),
+            reverse(POST_EDIT_URL_NAME, kwargs={'post_id': self.post.id}),
+            reverse(POST_CREATE_URL_NAME),
+        )
+        for client in (self.client, self.authorized_client):
+            for url in urls:
+                with self.subTest(url=url, client=client):
+                    cache.clear()
+                    client.get(url)
+
+    def test_forms_fit_query_budget(self):
+        """Отправка форм создания и правки укладывается в бюджет."""
+        self.authorized_client.post(
+            reverse(POST_CREATE_URL_NAME),
+            data={'text': 'Новый пост', 'group': self.groups[0].id},
+        )
+        self.authorized_client.post(
+            reverse(POST_EDIT_URL_NAME, kwargs={'post_id': self.post.id}),
+            data={'text': 'Правка', 'group': self.groups[1].id},
+        )
+
+    def test_exceeded_budget_raises(self):
+        """Превышение бюджета в режиме raise приводит к исключению."""
+        profile = views.profile
+        self.addCleanup(setattr, profile, 'query_budget', profile.query_budget)
+        query_budget(1)(profile)
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'при бюджете 1'):
+            self.authorized_client.get(
+                reverse(PROFILE_URL_NAME, kwargs={'username': self.user})
+            )
+
+    def test_report_shows_duplicated_sql_origin(self):
+        """В отчете есть повторяющийся SQL и строка, откуда он вызван."""
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            titles = [post.group.title for post in self.user.posts.all()]
+        report = recorder.report('posts:profile', 1)
+        self.assertEqual(len(titles), TEST_OF_POST)
+        self.assertIn(f'{TEST_OF_POST} x SELECT', report)
+        self.assertIn('posts_group', report)
+        self.assertIn(f'{__file__}:', report)
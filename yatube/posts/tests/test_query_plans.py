@@ -0,0 +1,51 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from posts.models import Group, Post, User
+
+POST_LIMIT = 10
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+$')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class FeedQueryPlanTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(text='Тестовый пост', author=cls.user,
+                            group=cls.group)
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def test_feed_queries_use_indexes(self):
+        """Запросы лент не сортируют во временном B-дереве
+        и не сканируют таблицу целиком."""
+        feeds = {
+            'index': Post.objects.select_related('author', 'group').all(),
+            'group_list': self.group.posts.select_related(
+                'author', 'group'
+            ).all(),
+            'profile': self.user.posts.select_related('group').all(),
+        }
+        for name, queryset in feeds.items():
+            for ordering in (('-pub_date',), ('-pub_date', '-id')):
+                with self.subTest(feed=name, ordering=ordering):
+                    plan = self.explain(
+                        queryset.order_by(*ordering)[:POST_LIMIT]
+                    )
+                    for detail in plan:
+                        self.assertNotIn('TEMP B-TREE', detail, plan)
+                        self.assertIsNone(FULL_SCAN.match(detail), plan)
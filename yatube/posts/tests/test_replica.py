@@ -0,0 +1,112 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.db_router import ReplicaRouter, set_replica_reads
+from posts.models import Group, Post, User
+from .constants import (
+    INDEX_URL_NAME,
+    POST_CREATE_URL_NAME,
+)
+
+REPLICA = 'replica_test'
+
+
+@override_settings(DATABASE_REPLICAS=(REPLICA,))
+class ReplicaRoutingTest(TransactionTestCase):
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.databases[REPLICA] = dict(
+            connections.databases['default'],
+            NAME=os.path.join(cls.directory.name, 'replica.sqlite3'),
+        )
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections.databases[REPLICA]
+        delattr(connections._connections, REPLICA)
+        cls.directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kir')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(text='Старый пост', author=self.user)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.sync()
+
+    def sync(self):
+        call_command('sync_replica', database=[REPLICA], stdout=StringIO())
+
+    def test_router(self):
+        """Чтения идут на реплику только в режиме чтения с реплик."""
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Post), 'default')
+        set_replica_reads(True)
+        self.addCleanup(set_replica_reads, False)
+        self.assertEqual(router.db_for_read(Post), REPLICA)
+        self.assertEqual(router.db_for_read(User), 'default')
+        self.assertEqual(router.db_for_write(Post), 'default')
+
+    def test_login_after_sync_keeps_session(self):
+        """Вход после копирования реплики не теряется при чтении с нее."""
+        client = Client()
+        client.force_login(User.objects.create_user(username='max'))
+        response = client.get(reverse(INDEX_URL_NAME))
+        self.assertContains(response, 'Пользователь: max')
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_read_views_use_replica(self):
+        """Лента читается с реплики, скопированной после сброса лент."""
+        Post.objects.update(text='Несинхронизированный пост')
+        response = self.client.get(reverse(INDEX_URL_NAME))
+        self.assertContains(response, 'Старый пост')
+        self.assertNotContains(response, 'Несинхронизированный пост')
+
+    def test_stale_replica_not_cached(self):
+        """Пока реплика не скопирована после сброса лент, страница
+        считается по основной базе и не застревает в кеше."""
+        Post.objects.create(text='Несинхронизированный пост', author=self.user)
+        for _ in range(2):
+            self.assertContains(
+                self.client.get(reverse(INDEX_URL_NAME)),
+                'Несинхронизированный пост'
+            )
+        self.sync()
+        Post.objects.update(text='Обновленный пост')
+        self.assertContains(
+            self.client.get(reverse(INDEX_URL_NAME)),
+            'Несинхронизированный пост'
+        )
+
+    def test_author_reads_own_writes(self):
+        """После записи автор и остальные видят новый пост."""
+        response = self.authorized_client.post(
+            reverse(POST_CREATE_URL_NAME), data={'text': 'Свежий пост'}
+        )
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertContains(
+            self.authorized_client.get(reverse(INDEX_URL_NAME)),
+            'Свежий пост'
+        )
+        self.assertContains(
+            self.client.get(reverse(INDEX_URL_NAME)), 'Свежий пост'
+        )
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.urls import (
+    NoReverseMatch, get_script_prefix, reverse, set_script_prefix
+)
+
+from core.reverse import cached_reverse, url_template
+from posts.models import Group, Post, User, profile_url
+from .constants import (
+    GROUP_LIST_URL_NAME, POST_DETAIL_URL_NAME, PROFILE_URL_NAME
+)
+
+USERNAMES = ('kir', 'user@mail+tag.name-x', 'Кирилл_1')
+
+
+class CachedReverseTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+
+    def test_same_as_reverse(self):
+        """Адреса совпадают с reverse()."""
+        cases = [
+            (
+                self.post.get_absolute_url(),
+                reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id})
+            ),
+            (
+                self.group.get_absolute_url(),
+                reverse(GROUP_LIST_URL_NAME, kwargs={'slug': self.group.slug})
+            ),
+        ] + [
+            (
+                profile_url(User(username=username)),
+                reverse(PROFILE_URL_NAME, kwargs={'username': username})
+            )
+            for username in USERNAMES
+        ]
+        for url, expected in cases:
+            with self.subTest(url=url):
+                self.assertEqual(url, expected)
+
+    def test_script_prefix(self):
+        """Префикс скрипта учитывается так же, как в reverse()."""
+        self.addCleanup(set_script_prefix, get_script_prefix())
+        set_script_prefix('/yatube/')
+        self.assertEqual(
+            self.group.get_absolute_url(),
+            reverse(GROUP_LIST_URL_NAME, kwargs={'slug': self.group.slug})
+        )
+        self.assertTrue(self.group.get_absolute_url().startswith('/yatube/'))
+
+    def test_invalid_value_raises_like_reverse(self):
+        """Неподходящее значение дает ту же ошибку, что и reverse()."""
+        for view_name, kwarg, value in (
+            (GROUP_LIST_URL_NAME, 'slug', 'не slug'),
+            (POST_DETAIL_URL_NAME, 'post_id', 'abc'),
+            (PROFILE_URL_NAME, 'username', 'a/b'),
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(NoReverseMatch):
+                    cached_reverse(view_name, kwarg, value)
+
+    def test_template_built_once(self):
+        """Шаблон адреса строится один раз."""
+        self.post.get_absolute_url()
+        hits = url_template.cache_info().hits
+        Post(pk=10 ** 6).get_absolute_url()
+        self.assertEqual(url_template.cache_info().hits, hits + 1)
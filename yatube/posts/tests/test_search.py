@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.search import fts_query, restore_fts_triggers, search_posts
+from .constants import SEARCH_URL_NAME, SEARCH_URL_TEMPLATE
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.weak = Post.objects.create(
+            text='Кошка спит, а рядом лежит длинная книга про путешествия '
+                 'по северным морям и далеким странам',
+            author=cls.user,
+        )
+        cls.strong = Post.objects.create(
+            text='Кошка и кошка', author=cls.user
+        )
+        Post.objects.create(text='Собака гуляет', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, text):
+        return list(search_posts(Post.objects.all(), text))
+
+    def test_ranked_by_relevance(self):
+        """Результаты отсортированы по релевантности."""
+        self.assertEqual(self.search('кошка'), [self.strong, self.weak])
+
+    def test_all_words_required(self):
+        """Найдены только посты, где есть все слова запроса."""
+        self.assertEqual(self.search('кошка книга'), [self.weak])
+        self.assertEqual(self.search(''), [])
+
+    def test_operators_are_quoted(self):
+        """Операторы FTS5 во вводе считаются обычными словами."""
+        self.assertEqual(
+            fts_query('кошка OR "собака*'), '"кошка" "OR" "собака"'
+        )
+        self.assertEqual(self.search('кошка OR собака'), [])
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при изменении и удалении поста."""
+        strong = Post.objects.get(id=self.strong.id)
+        strong.text = 'Попугай'
+        strong.save()
+        self.assertEqual(self.search('кошка'), [self.weak])
+        self.assertEqual(self.search('попугай'), [strong])
+        Post.objects.filter(id=self.weak.id).delete()
+        self.assertEqual(self.search('кошка'), [])
+
+    def test_migrations_keep_triggers(self):
+        """После всех миграций триггеры FTS5 на месте."""
+        self.assertEqual(restore_fts_triggers(connection), [])
+
+    def test_lost_trigger_restored(self):
+        """Потерянный при пересборке таблицы триггер пересоздается."""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER posts_post_fts_insert')
+        fresh = Post.objects.create(text='Хомяк', author=self.user)
+        self.assertEqual(
+            restore_fts_triggers(connection), ['posts_post_fts_insert']
+        )
+        self.assertEqual(self.search('хомяк'), [fresh])
+        self.assertEqual(restore_fts_triggers(connection), [])
+
+    def test_search_page(self):
+        """Страница поиска показывает найденные посты."""
+        response = self.client.get(reverse(SEARCH_URL_NAME), {'q': 'собака'})
+        self.assertTemplateUsed(response, SEARCH_URL_TEMPLATE)
+        self.assertEqual(
+            [post.text for post in response.context['page_obj']],
+            ['Собака гуляет'],
+        )
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке идет по полнотекстовому индексу."""
+        admin = User.objects.create_superuser('admin', 'a@a.ru', 'pass')
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'книга'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.weak]
+        )
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.db import OperationalError, connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.sqlite import retry_on_locked
+
+
+class SqliteProfileTest(TestCase):
+    def test_pragmas_applied_on_connect(self):
+        """Новое соединение получает PRAGMA из настроек."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = DatabaseWrapper(
+            dict(
+                connections['default'].settings_dict,
+                NAME=os.path.join(directory.name, 'db.sqlite3'),
+            ),
+            alias='pragma_test',
+        )
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_no_retry_inside_transaction(self):
+        """Внутри транзакции запись не повторяется."""
+        write = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError), transaction.atomic():
+            retry_on_locked(write)()
+        self.assertEqual(write.call_count, 1)
+
+
+@override_settings(SQLITE_LOCK_BACKOFF=0)
+class RetryOnLockedTest(SimpleTestCase):
+    def test_retry_on_locked(self):
+        """Запись повторяется при блокировке базы."""
+        write = mock.Mock(side_effect=[
+            OperationalError('database is locked'),
+            OperationalError('database is locked'),
+            'ok',
+        ])
+        self.assertEqual(retry_on_locked(write)(), 'ok')
+        self.assertEqual(write.call_count, 3)
+
+    def test_no_retry_for_other_errors(self):
+        """Другие ошибки не повторяются."""
+        write = mock.Mock(side_effect=OperationalError('no such table'))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(write)()
+        self.assertEqual(write.call_count, 1)
+
+    @override_settings(SQLITE_LOCK_RETRIES=2)
+    def test_gives_up_after_retries(self):
+        """После исчерпания попыток ошибка пробрасывается."""
+        write = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(write)()
+        self.assertEqual(write.call_count, 3)
@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .constants import INDEX_URL_NAME
+
+CSS = 'css/bootstrap.min.css'
+
+
+class StaticPipelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.static_root
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed = staticfiles_storage.stored_name(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def path(self, name):
+        return os.path.join(self.static_root, *name.split('/'))
+
+    def test_collectstatic_writes_hashed_and_gzip(self):
+        """collectstatic пишет манифест, файлы с хешем и .gz копии."""
+        with open(self.path('staticfiles.json')) as manifest:
+            self.assertEqual(json.load(manifest)['paths'][CSS], self.hashed)
+        self.assertNotEqual(self.hashed, CSS)
+        with open(self.path(self.hashed), 'rb') as original:
+            content = original.read()
+        with open(self.path(self.hashed) + '.gz', 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), content)
+
+    def test_hashed_file_served_compressed_and_immutable(self):
+        """Файл с хешем отдается сжатым и кешируется навсегда."""
+        response = self.client.get(
+            f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('immutable', response['Cache-Control'])
+        with open(self.path(self.hashed) + '.gz', 'rb') as compressed:
+            self.assertEqual(
+                b''.join(response.streaming_content), compressed.read()
+            )
+
+    def test_plain_file_without_accept_encoding(self):
+        """Без Accept-Encoding отдается исходный файл."""
+        response = self.client.get(f'/static/{self.hashed}')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        with open(self.path(self.hashed), 'rb') as original:
+            self.assertEqual(
+                b''.join(response.streaming_content), original.read()
+            )
+
+    def test_q_zero_refuses_encoding(self):
+        """Кодировка с q=0 не выбирается, вес q учитывается."""
+        for header, encoding in (
+            ('gzip;q=0', None),
+            ('gzip; q=0.0, identity', None),
+            ('*;q=0', None),
+            ('*', 'gzip'),
+            ('br;q=0, *;q=0.5', 'gzip'),
+            ('deflate, gzip;q=0.8', 'gzip'),
+        ):
+            with self.subTest(header=header):
+                response = self.client.get(
+                    f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING=header
+                )
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+
+    def test_unhashed_file_short_cache(self):
+        """Файл без хеша в имени кешируется ненадолго."""
+        response = self.client.get(f'/static/{CSS}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_missing_file_not_found(self):
+        """Несуществующий файл и выход за STATIC_ROOT дают 404."""
+        for url in ('/static/css/missing.css', '/static/../manage.py'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_pages_link_hashed_names(self):
+        """Страницы ссылаются на статику с хешем в имени."""
+        response = self.client.get(reverse(INDEX_URL_NAME))
+        self.assertContains(response, f'/static/{self.hashed}')
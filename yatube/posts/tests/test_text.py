@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils.html import escape
+
+from posts.models import Post, User
+from posts.text import EXCERPT_LENGTH
+from .constants import (
+    INDEX_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    POST_EDIT_URL_NAME,
+)
+
+TEXT = 'Первая строка <b>жирная</b>\nВторая строка поста, довольно длинная'
+TEXT_HTML = (
+    'Первая строка &lt;b&gt;жирная&lt;/b&gt;<br>'
+    'Вторая строка поста, довольно длинная'
+)
+
+
+class RenderedTextTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.post = Post.objects.create(text=TEXT, author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_save_renders_text(self):
+        """При сохранении текст экранируется, переносы становятся <br>."""
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.text_html, TEXT_HTML)
+        self.assertEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertTrue(TEXT.startswith(post.excerpt[:-1]))
+
+    def test_edit_form_renders_text(self):
+        """Правка поста через форму пересчитывает HTML."""
+        self.authorized_client.post(
+            reverse(POST_EDIT_URL_NAME, kwargs={'post_id': self.post.id}),
+            data={'text': 'Новый\nтекст'},
+        )
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.text_html, 'Новый<br>текст')
+        self.assertEqual(post.excerpt, 'Новый\nтекст')
+
+    def test_bulk_create_renders_text(self):
+        """Массовая вставка тоже считает HTML и начало текста."""
+        Post.objects.bulk_create(
+            [Post(text='Пакет\nпостов', author=self.user)]
+        )
+        post = Post.objects.get(text='Пакет\nпостов')
+        self.assertEqual(post.text_html, 'Пакет<br>постов')
+        self.assertEqual(post.excerpt, 'Пакет\nпостов')
+
+    def test_backfill_command(self):
+        """Команда заполняет HTML у постов, где его нет."""
+        Post.objects.update(text_html='', excerpt='')
+        call_command('render_post_text', '--chunk-size=1', stdout=StringIO())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.text_html, TEXT_HTML)
+        self.assertNotEqual(post.excerpt, '')
+
+    def test_backfill_refreshes_cached_pages(self):
+        """После пересчета страницы и фрагменты выводят новый HTML."""
+        Post.objects.update(text_html='Старый HTML')
+        urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id}),
+        )
+        for url in urls:
+            self.assertContains(self.client.get(url), 'Старый HTML')
+        call_command('render_post_text', stdout=StringIO())
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), TEXT_HTML)
+
+    def test_detail_page_uses_rendered_text(self):
+        """Страница поста выводит посчитанный HTML без повторного
+        экранирования."""
+        response = self.client.get(
+            reverse(POST_DETAIL_URL_NAME, kwargs={'post_id': self.post.id})
+        )
+        self.assertContains(response, TEXT_HTML)
+        excerpt = Post.objects.get(pk=self.post.pk).excerpt
+        self.assertContains(response, escape(excerpt))
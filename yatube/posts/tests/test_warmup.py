@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase
+
+from core.warmup import STEPS, url_patterns, warm_up
+from posts.models import Group, Post, User
+from .constants import INDEX_URL_NAME, POST_DETAIL_URL_NAME
+
+
+class WarmUpTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='kir')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+
+    def test_url_patterns_skip_admin(self):
+        """Прогрев обходит все именованные адреса, кроме админки."""
+        names = {name for name, _ in url_patterns()}
+        self.assertIn(INDEX_URL_NAME, names)
+        self.assertIn(POST_DETAIL_URL_NAME, names)
+        self.assertFalse([name for name in names if name.startswith('admin')])
+
+    def test_warm_up_runs_all_steps(self):
+        """Прогрев компилирует шаблоны и делает запросы ко всем адресам."""
+        report = warm_up()
+        self.assertEqual(list(report), [name for name, _ in STEPS])
+        self.assertGreater(report['templates']['count'], 0)
+        self.assertGreater(report['requests']['count'], 10)
+
+    def test_failed_step_skipped(self):
+        """Ошибка БД в шаге прогрева пишется в лог и не прерывает его."""
+        with mock.patch(
+            'core.warmup.url_samples',
+            side_effect=OperationalError('no such table: posts_post'),
+        ), self.assertLogs('core.warmup', 'ERROR'):
+            report = warm_up()
+        self.assertIsNone(report['requests']['count'])
+        self.assertGreater(report['templates']['count'], 0)
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 30
+BACKFILL_CHUNK_SIZE = 2000
+
+
+def render_text(text):
+    """HTML тела поста: экранированный текст с <br> на месте переносов."""
+    return str(linebreaksbr(text, autoescape=True))
+
+
+def make_excerpt(text):
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
+
+def backfill_rendered_text(model, chunk_size=BACKFILL_CHUNK_SIZE,
+                           missing_only=False):
+    """Пересчитывает text_html и excerpt пачками по возрастанию id.
+
+    После каждой пачки отдает число обработанных постов и список постов,
+    у которых HTML или начало текста изменились.
+    """
+    queryset = model._default_manager.order_by('pk').only(
+        'pk', 'text', 'text_html', 'excerpt', 'author', 'group'
+    )
+    if missing_only:
+        queryset = queryset.filter(text_html='')
+    last_pk = 0
+    done = 0
+    while True:
+        posts = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not posts:
+            return
+        changed = []
+        for post in posts:
+            text_html = render_text(post.text)
+            excerpt = make_excerpt(post.text)
+            if (post.text_html, post.excerpt) != (text_html, excerpt):
+                post.text_html, post.excerpt = text_html, excerpt
+                changed.append(post)
+        if changed:
+            with transaction.atomic():
+                model._default_manager.bulk_update(
+                    changed, ('text_html', 'excerpt')
+                )
+        done += len(posts)
+        last_pk = posts[-1].pk
+        yield done, changed
@@ -1,34 +1,58 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
 
-from .models import Post, Group, User
+from core.query_budget import query_budget
+from core.sqlite import retry_on_locked
+
+from .models import Post, Group, User, get_posts_count
+from .cache import (
+    cache_feed_page, conditional_feed, feed_count_key, group_feed,
+    index_feed, post_feeds, profile_feed
+)
 from .forms import PostForm
+from .paginators import CursorPaginator, FeedPaginator
+from .search import search_posts
 
 
 TEN_POSTS_IN_PAGE = 10
 
 
-def get_page(request, post_list):
-    paginator = Paginator(post_list, TEN_POSTS_IN_PAGE)
+def get_page(request, post_list, count=None, count_key=None):
+    if request.resolver_match.url_name in settings.CURSOR_PAGINATION_VIEWS:
+        paginator = CursorPaginator(post_list, TEN_POSTS_IN_PAGE)
+        return paginator.get_page(request.GET.get('cursor'))
+    paginator = FeedPaginator(
+        post_list, TEN_POSTS_IN_PAGE, count=count, count_key=count_key
+    )
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
 
 
+@query_budget(4)
+@conditional_feed(index_feed)
+@cache_feed_page(index_feed)
 def index(request):
-    post_list = Post.objects.select_related('author', 'group').all()
-    page_obj = get_page(request, post_list)
+    post_list = Post.objects.feed()
+    page_obj = get_page(
+        request, post_list, count_key=feed_count_key(index_feed())
+    )
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@query_budget(4)
+@conditional_feed(group_feed)
+@cache_feed_page(group_feed)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.select_related('author', 'group').all()
-    page_obj = get_page(request, post_list)
+    post_list = group.posts.feed()
+    page_obj = get_page(request, post_list, count=group.posts_count)
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -36,28 +60,54 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@query_budget(4)
+@conditional_feed(profile_feed)
+@cache_feed_page(profile_feed)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    page_obj = get_page(request, post_list)
+    author = get_object_or_404(
+        User.objects.select_related('post_counter'), username=username
+    )
+    posts_count = get_posts_count(author)
+    post_list = author.posts.feed(related=('group',))
+    page_obj = get_page(request, post_list, count=posts_count)
     context = {
         'author': author,
+        'posts_count': posts_count,
         'page_obj': page_obj,
     }
     return render(request, 'posts/profile.html', context)
 
 
+@query_budget(4)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = search_posts(Post.objects.feed(), query)
+    context = {
+        'query': query,
+        'page_obj': get_page(request, post_list),
+        'page_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@query_budget(4)
+@conditional_feed(post_feeds)
+@cache_feed_page(post_feeds)
 def post_detail(request, post_id):
     post = get_object_or_404(
-        Post.objects.select_related('author', 'group'), id=post_id
+        Post.objects.select_related('author__post_counter', 'group'),
+        id=post_id
     )
     context = {
         'post': post,
+        'posts_count': get_posts_count(post.author),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(14)
 @login_required
+@retry_on_locked
 def post_create(request):
     form = PostForm(request.POST or None)
     context = {'form': form, }
@@ -69,7 +119,9 @@ def post_create(request):
     return redirect('posts:profile', username=request.user)
 
 
+@query_budget(15)
 @login_required
+@retry_on_locked
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = PostForm(request.POST or None, instance=post)
@@ -77,7 +129,7 @@ def post_edit(request, post_id):
         'form': form,
         'is_edit': True,
     }
-    if post.author == request.user:
+    if post.author_id == request.user.id:
         if form.is_valid():
             form.save()
             return redirect('posts:post_detail', post_id=post_id)
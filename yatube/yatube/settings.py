@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -49,11 +50,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.PrecompressedStaticMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SamplingProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,9 +93,109 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# PRAGMA для каждого нового соединения с SQLite: WAL пускает чтение
+# параллельно с записью, busy_timeout ждет снятия блокировки вместо ошибки
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Сколько раз повторять запись при 'database is locked' и первая пауза
+# в секундах, дальше пауза удваивается
+SQLITE_LOCK_RETRIES = 5
+SQLITE_LOCK_BACKOFF = 0.05
+
+# Реплики только для чтения: пути к копиям базы через запятую в переменной
+# окружения YATUBE_REPLICAS; копии обновляет команда sync_replica
+REPLICA_PATHS = [
+    path for path in os.environ.get('YATUBE_REPLICAS', '').split(',') if path
+]
+for number, path in enumerate(REPLICA_PATHS):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = tuple(
+    f'replica{number}' for number in range(len(REPLICA_PATHS))
+)
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# View, которые читают с реплик, и сколько секунд после записи
+# пользователь читает с основной базы
+REPLICA_READ_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'about:author',
+    'about:tech',
+)
+REPLICA_PIN_COOKIE = 'primary_pin'
+REPLICA_PIN_SECONDS = 10
+
+
+# Поколения лент, счетчики и блокировки кеша страниц должны быть общими
+# для всех воркеров, а incr и add - атомарными. Кеш в памяти процесса
+# годится для разработки и одного процесса; в продакшене с несколькими
+# воркерами обязателен memcached или redis: задайте YATUBE_CACHE_BACKEND
+# и YATUBE_CACHE_LOCATION
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'YATUBE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('YATUBE_CACHE_LOCATION', ''),
+    }
+}
+
+# Сколько секунд страница ленты в кеше считается свежей
+FEED_CACHE_TIMEOUT = 60 * 15
+
+# Сколько секунд после срока свежести отдавать устаревшую страницу, пока
+# один запрос ее пересчитывает
+FEED_STALE_TIMEOUT = 60
+
+# Блокировка пересчета страницы: время жизни, сколько секунд другие
+# запросы ждут результата, если копии в кеше нет, и период проверки
+FEED_LOCK_TIMEOUT = 10
+FEED_LOCK_WAIT = 2
+FEED_LOCK_POLL = 0.05
+
+# Коэффициент досрочного обновления: больше - раньше обновляются страницы,
+# которые долго считаются; 0 - обновлять только по истечении срока
+FEED_EARLY_EXPIRY_BETA = 1.0
+
+# Шаблоны фрагментов, которые тег donut вырезает из кешируемых страниц
+# и отрисовывает для каждого запроса; другие имена в метках не выводятся
+DONUT_TEMPLATES = (
+    'includes/user_menu.html',
+    'includes/post_edit_link.html',
+)
+
+# Сколько секунд хранится отрисованный пост; ключ меняется при правке поста
+POST_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+# Что делать, если view превысила бюджет SQL-запросов из @query_budget:
+# 'off' - не считать, 'log' - предупреждение в лог, 'raise' - исключение
+QUERY_BUDGET_MODE = 'off'
+
+# Профилирование запросов: доля случайно выбранных запросов, период снятия
+# стеков в секундах и каталог для файлов collapsed-стеков
+PROFILER_SAMPLE_RATE = 0
+PROFILER_INTERVAL = 0.001
+PROFILER_DIR = os.path.join(BASE_DIR, 'profiles')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -132,12 +237,36 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
+# collectstatic добавляет хеш содержимого в имена файлов и кладет рядом
+# сжатые .gz и .br копии; отдает их PrecompressedStaticMiddleware
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Сколько секунд браузер хранит статику: файлы с хешем в имени не меняются,
+# файлы без хеша могут смениться при следующем выпуске
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_UNHASHED_MAX_AGE = 60 * 60
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
+# Ленты, которые листаются по курсору (pub_date, id) вместо номера страницы
+CURSOR_PAGINATION_VIEWS = ()
+
+# Сколько номеров страниц показывать по обе стороны от текущей
+PAGINATOR_WINDOW = 2
+
+# Сколько секунд хранится посчитанное число постов ленты
+PAGINATOR_COUNT_TIMEOUT = 60 * 5
+
+# С какого числа постов список в админке без фильтров показывает
+# примерное число по статистике таблицы вместо COUNT
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
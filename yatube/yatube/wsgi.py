@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Прогрев до fork воркеров, если сервер импортирует приложение заранее
+if os.environ.get('YATUBE_WARMUP'):
+    from core.warmup import warm_up
+
+    warm_up()